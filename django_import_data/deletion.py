@@ -0,0 +1,104 @@
+"""Provides fast_delete: set-based deletion of querysets
+
+QuerySet.delete() uses Django's deletion Collector, which fetches every object
+being deleted (and every object that is cascade-deleted along with them) into
+memory first, so that it can send signals and handle every kind of on_delete.
+For the models of a large import, this is both slow and memory-hungry.
+
+fast_delete instead deletes a queryset via set-based statements: first,
+recursively, everything that cascades from it, then the queryset itself, each
+via a single DELETE (only the IDs of the objects are fetched, never the objects
+themselves). SET_NULL relations are handled via a single UPDATE each, as are
+custom on_delete functions that provide a set-based equivalent of themselves
+as their fast_delete attribute (see models.SET_PREVIOUS_ATTEMPT).
+
+This is only equivalent to QuerySet.delete() if nothing needs to see the
+individual objects, so get_fallback_reasons should be consulted first: if it
+returns anything, QuerySet.delete() must be used instead (and fast_delete
+does exactly that).
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import CASCADE, DO_NOTHING, SET_NULL, signals
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+# The signals that the Collector sends (and thus that we can't)
+DELETION_SIGNALS = (signals.pre_delete, signals.post_delete, signals.m2m_changed)
+
+
+def get_fallback_reasons(model, _path=()):
+    """Return a list of reasons that model can't be fast-deleted
+
+    If this is empty, fast_delete will produce the same results as
+    QuerySet.delete() would for any queryset of model"""
+
+    opts = model._meta
+    if model in _path:
+        return [f"{opts.label} is part of a cycle of cascading relations"]
+
+    reasons = []
+    if any(signal.has_listeners(model) for signal in DELETION_SIGNALS):
+        reasons.append(f"{opts.label} has deletion signal receivers")
+    if opts.concrete_model._meta.parents:
+        reasons.append(f"{opts.label} uses multi-table inheritance")
+    if any(hasattr(field, "bulk_related_objects") for field in opts.private_fields):
+        reasons.append(f"{opts.label} has a generic relation")
+
+    for related in get_candidate_relations_to_delete(opts):
+        on_delete = related.field.remote_field.on_delete
+        if on_delete is CASCADE:
+            reasons.extend(get_fallback_reasons(related.related_model, (*_path, model)))
+        elif on_delete not in (SET_NULL, DO_NOTHING) and not hasattr(
+            on_delete, "fast_delete"
+        ):
+            reasons.append(
+                f"{related.related_model._meta.label}.{related.field.name} "
+                f"has on_delete={on_delete.__name__}"
+            )
+
+    return reasons
+
+
+def _fast_delete(queryset):
+    # The queryset's IDs must be fetched up front: it is used as a subquery
+    # below, and its filters might depend upon the very objects that are
+    # cascade-deleted before it is
+    ids = list(queryset.values_list("pk", flat=True))
+    if not ids:
+        return (0, Counter())
+    queryset = queryset.model._base_manager.using(queryset.db).filter(pk__in=ids)
+
+    deletions = Counter()
+    for related in get_candidate_relations_to_delete(queryset.model._meta):
+        field = related.field
+        related_queryset = related.related_model._base_manager.using(
+            queryset.db
+        ).filter(**{f"{field.name}__in": queryset})
+        if field.remote_field.on_delete is CASCADE:
+            deletions += _fast_delete(related_queryset)[1]
+        elif field.remote_field.on_delete is SET_NULL:
+            related_queryset.update(**{field.name: None})
+        elif hasattr(field.remote_field.on_delete, "fast_delete"):
+            field.remote_field.on_delete.fast_delete(related_queryset, field, queryset)
+
+    deletions[queryset.model._meta.label] += queryset._raw_delete(queryset.db)
+    # Omit models that had nothing to delete, as Counter addition would
+    deletions = +deletions
+    return (sum(deletions.values()), deletions)
+
+
+@transaction.atomic
+def fast_delete(queryset):
+    """Delete queryset, and everything that cascades from it, in bulk
+
+    Return a (num_deletions, Counter) tuple of the same form as
+    QuerySet.delete()'s. If queryset can't be fast-deleted, it is simply
+    deleted via QuerySet.delete() instead"""
+
+    if get_fallback_reasons(queryset.model):
+        num_deletions, deletions = queryset.delete()
+        return (num_deletions, Counter(deletions))
+
+    return _fast_delete(queryset)
@@ -17,14 +17,77 @@ from the list of FieldMap instances
 DEFAULT_CONVERTER = None
 DEFAULT_ALLOW_UNKNOWN = True
 DEFAULT_ALLOW_MULTIPLE_ALIASES_FOR_FIELD = False
+DEFAULT_CONVERTER_CACHE_SIZE = 1024
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import update_wrapper
 from inspect import getfullargspec
 
 from .mermaid import render_field_map_as_mermaid
 from .utils import to_fancy_str
 
 
+class MemoizedConverter:
+    """Wrap a converter such that its results are cached in a bounded LRU cache
+
+    Both return values and raised ValueErrors are cached, so that conversion
+    errors are reproduced exactly. Calls with unhashable arguments are passed
+    straight through to the converter. This should only be used for converters
+    that are pure; that is, whose results depend only upon their arguments"""
+
+    def __init__(self, converter, maxsize=DEFAULT_CONVERTER_CACHE_SIZE):
+        update_wrapper(self, converter)
+        self.converter = converter
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            is_error, result = self.cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments; nothing we can do but call the converter
+            return self.converter(*args, **kwargs)
+        else:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            if is_error:
+                raise result.with_traceback(None)
+            return result
+
+        self.misses += 1
+        try:
+            result = self.converter(*args, **kwargs)
+        except ValueError as error:
+            self._store(key, (True, error))
+            raise
+        self._store(key, (False, result))
+        return result
+
+    def _store(self, key, value):
+        self.cache[key] = value
+        if self.maxsize is not None and len(self.cache) > self.maxsize:
+            # Evict the least recently used entry
+            self.cache.popitem(last=False)
+
+    def cache_info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.cache),
+            "maxsize": self.maxsize,
+        }
+
+    def cache_clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class FieldMap:
     """Map a to_field to its associated from_fields, a converter function, and any aliases"""
 
@@ -43,6 +106,9 @@ class FieldMap:
         converter=DEFAULT_CONVERTER,
         aliases=None,
         explanation=None,
+        vectorized=False,
+        cache=False,
+        cache_size=None,
     ):
         # Strings are iterable, so will "work" for a large portion of the
         # processing, but aren't ever actually correct. So, just catch this
@@ -52,6 +118,17 @@ class FieldMap:
 
         self.to_fields = to_fields
         self.from_fields = from_fields
+        # If cache is True (or a cache_size is given), the converter's results
+        # will be memoized (see MemoizedConverter). This must be set before
+        # the converter is
+        if cache_size is not None:
+            cache = True
+        if cache and vectorized:
+            raise ValueError("A vectorized converter cannot be cached!")
+        self.cache = cache
+        self.cache_size = (
+            cache_size if cache_size is not None else DEFAULT_CONVERTER_CACHE_SIZE
+        )
         # Function to convert/clean data. Only set if it is actually given!
         # This allows child classes to make their own decisions regarding it
         # if converter is not None:
@@ -92,6 +169,27 @@ class FieldMap:
             )
 
         self.explanation = explanation
+        # If True, converter is given entire columns (lists) of values at once
+        # by render_many_unaliased, and must return a list of results
+        self.vectorized = vectorized
+
+    @property
+    def converter(self):
+        return self._converter
+
+    @converter.setter
+    def converter(self, converter):
+        # NOTE: The converter may not be callable yet; FormMap resolves those
+        # that are given by name (and then sets them here again)
+        if self.cache and callable(converter):
+            converter = MemoizedConverter(converter, maxsize=self.cache_size)
+        self._converter = converter
+
+    def get_converter_stats(self):
+        """Return the hit/miss statistics of the converter's cache, if it has one"""
+        if isinstance(self.converter, MemoizedConverter):
+            return self.converter.cache_info()
+        return None
 
     @classmethod
     def _expand_aliases(cls, fields_to_aliases):
@@ -203,28 +301,27 @@ class FieldMap:
             ]
         return self.from_fields
 
-    def unalias(
+    def compile(
         self,
-        data,
-        allow_unknown=DEFAULT_ALLOW_UNKNOWN,
+        headers,
         allow_multiple_aliases_for_field=DEFAULT_ALLOW_MULTIPLE_ALIASES_FOR_FIELD,
     ):
-        unaliased_data = {}
+        """Determine which of the given headers this FieldMap consumes
+
+        Return a tuple of (header, unaliased_field) pairs, in header order, along
+        with a dict of {unaliased_field: [aliases found in headers]}. Since this
+        depends only upon the headers, it can be computed once and then applied
+        to every row that shares them"""
+
+        pairs = []
         found_aliases = defaultdict(list)
-        for alias, value in data.items():
+        for alias in headers:
             if alias in self.known_fields:
                 # Get the unaliased alias, or, if there's no alias, just
                 # use the alias name as is
                 unaliased_field = self.aliases.get(alias, alias)
                 found_aliases[unaliased_field].append(alias)
-                unaliased_data[unaliased_field] = value
-            else:
-                if not allow_unknown:
-                    raise ValueError(
-                        f"Field {alias} is not a known field "
-                        f"({self.known_fields})! To suppress this error, "
-                        "pass allow_unknown=True"
-                    )
+                pairs.append((alias, unaliased_field))
         if not allow_multiple_aliases_for_field:
             found_aliases = dict(found_aliases)
             duplicated_aliases = {
@@ -237,6 +334,28 @@ class FieldMap:
                     f"More than one alias found in the data: {duplicated_aliases}. "
                     "This indicates that you probably need to split this FieldMap in two..."
                 )
+        return tuple(pairs), found_aliases
+
+    def unalias(
+        self,
+        data,
+        allow_unknown=DEFAULT_ALLOW_UNKNOWN,
+        allow_multiple_aliases_for_field=DEFAULT_ALLOW_MULTIPLE_ALIASES_FOR_FIELD,
+    ):
+        if not allow_unknown:
+            for alias in data:
+                if alias not in self.known_fields:
+                    raise ValueError(
+                        f"Field {alias} is not a known field "
+                        f"({self.known_fields})! To suppress this error, "
+                        "pass allow_unknown=True"
+                    )
+        pairs, found_aliases = self.compile(
+            data, allow_multiple_aliases_for_field=allow_multiple_aliases_for_field
+        )
+        unaliased_data = {
+            unaliased_field: data[alias] for alias, unaliased_field in pairs
+        }
         return unaliased_data, found_aliases
 
     # TODO: This has no place here... this should _perhaps_ perform
@@ -249,13 +368,25 @@ class FieldMap:
         allow_unknown=DEFAULT_ALLOW_UNKNOWN,
         allow_multiple_aliases_for_field=DEFAULT_ALLOW_MULTIPLE_ALIASES_FOR_FIELD,
     ):
-        if converter is None:
-            converter = self.converter
         ret, __ = self.unalias(
             data,
             allow_unknown=allow_unknown,
             allow_multiple_aliases_for_field=allow_multiple_aliases_for_field,
         )
+        return self.render_unaliased(ret, converter=converter)
+
+    @property
+    def overrides_render(self):
+        """True if this FieldMap's class overrides render itself
+
+        FormMaps render via render plans (see compile), which bypass render.
+        Such FieldMaps must instead be rendered via render, one row at a time"""
+        return type(self).render is not FieldMap.render
+
+    def render_unaliased(self, ret, converter=DEFAULT_CONVERTER):
+        """Render the given already-unaliased data (see unalias)"""
+        if converter is None:
+            converter = self.converter
         if not ret:
             # print(f"WARNING: Failed to produce value for {data}")
             return {}
@@ -291,6 +422,70 @@ class FieldMap:
                 f"Converter {converter.__name__} ({argspec.args}) rejected given args: {list(ret)}"
             ) from error
 
+    def render_many_unaliased(self, rets, converter=DEFAULT_CONVERTER):
+        """Render each of the given already-unaliased rows (see unalias)
+
+        All rows must have the same keys (as is the case for rows that share a
+        render plan). Return a list containing, for each row, either its
+        rendered result or the ValueError raised while converting it.
+
+        If this FieldMap is vectorized, its converter is called only once,
+        with a list of values per from_field (positionally for 1:1, otherwise
+        by keyword), and must return a list of per-row results (each of the
+        same form as a non-vectorized converter would return). If that call
+        raises a ValueError, the rows are instead converted one at a time, so
+        that the error(s) can be attributed to the correct row(s)"""
+
+        if not self.vectorized:
+            return [self._render_or_error(ret, converter) for ret in rets]
+
+        try:
+            return self.render_vectorized(rets, converter=converter)
+        except ValueError:
+            return [
+                self._render_or_error(ret, converter, render=self.render_one_vectorized)
+                for ret in rets
+            ]
+
+    def _render_or_error(self, ret, converter, render=None):
+        if render is None:
+            render = self.render_unaliased
+        try:
+            return render(ret, converter=converter)
+        except ValueError as error:
+            return error
+
+    def render_one_vectorized(self, ret, converter=DEFAULT_CONVERTER):
+        return self.render_vectorized([ret], converter=converter)[0]
+
+    def render_vectorized(self, rets, converter=DEFAULT_CONVERTER):
+        if converter is None:
+            converter = self.converter
+        # Rows sharing a render plan all have the same keys, so if the first
+        # is empty they all are
+        if not rets or not rets[0]:
+            return [{} for __ in rets]
+
+        columns = {field: [ret[field] for ret in rets] for field in rets[0]}
+        if self.map_type == self.ONE_TO_ONE:
+            converted = converter(next(iter(columns.values())))
+        else:
+            converted = converter(**columns)
+        if len(converted) != len(rets):
+            raise TypeError(
+                f"Vectorized converter {converter.__name__} returned "
+                f"{len(converted)} results for {len(rets)} rows"
+            )
+
+        # Handle the simple 1:1/n:1 cases in the same way that render does
+        if self.map_type in (self.ONE_TO_ONE, self.MANY_TO_ONE):
+            to_field = self.to_fields[0]
+            return [
+                value if isinstance(value, dict) else {to_field: value}
+                for value in converted
+            ]
+        return list(converted)
+
     def _explain_from_fields(self, form_fields, field_names):
         fields_verbose = []
         for field_name in field_names:
@@ -368,7 +563,14 @@ class OneToOneFieldMap(FieldMap):
     map_type = FieldMap.ONE_TO_ONE
 
     def __init__(
-        self, from_field, to_field=None, converter=DEFAULT_CONVERTER, explanation=None
+        self,
+        from_field,
+        to_field=None,
+        converter=DEFAULT_CONVERTER,
+        explanation=None,
+        vectorized=False,
+        cache=False,
+        cache_size=None,
     ):
         # If from_field is a dict then it contains a single field along with its aliases
         if isinstance(from_field, dict):
@@ -400,6 +602,9 @@ class OneToOneFieldMap(FieldMap):
             to_fields=[to_field],
             converter=converter,
             explanation=explanation,
+            vectorized=vectorized,
+            cache=cache,
+            cache_size=cache_size,
         )
         assert len(self.from_fields) == 1, "Should only be one from field!"
         self.from_field = self.from_fields[0]
@@ -411,20 +616,9 @@ class OneToOneFieldMap(FieldMap):
         """Perform no conversion; simply return value"""
         return value
 
-    def render(
-        self,
-        data,
-        converter=DEFAULT_CONVERTER,
-        allow_unknown=DEFAULT_ALLOW_UNKNOWN,
-        allow_multiple_aliases_for_field=DEFAULT_ALLOW_MULTIPLE_ALIASES_FOR_FIELD,
-    ):
+    def render_unaliased(self, ret, converter=DEFAULT_CONVERTER):
         if converter is None:
             converter = self.converter
-        ret, __ = self.unalias(
-            data,
-            allow_unknown=allow_unknown,
-            allow_multiple_aliases_for_field=allow_multiple_aliases_for_field,
-        )
         # Handle case where we don't have any mappings (need to bail early
         # to avoid breaking logic below)
         if not ret:
@@ -448,31 +642,30 @@ class ManyToOneFieldMap(FieldMap):
     map_type = FieldMap.MANY_TO_ONE
 
     def __init__(
-        self, from_fields, to_field, converter=DEFAULT_CONVERTER, explanation=None
+        self,
+        from_fields,
+        to_field,
+        converter=DEFAULT_CONVERTER,
+        explanation=None,
+        vectorized=False,
+        cache=False,
+        cache_size=None,
     ):
         super().__init__(
             from_fields=from_fields,
             to_fields=[to_field],
             converter=converter,
             explanation=explanation,
+            vectorized=vectorized,
+            cache=cache,
+            cache_size=cache_size,
         )
         assert len(self.to_fields) == 1, "Should only be one to field!"
         self.to_field = self.to_fields[0]
 
-    def render(
-        self,
-        data,
-        converter=DEFAULT_CONVERTER,
-        allow_unknown=DEFAULT_ALLOW_UNKNOWN,
-        allow_multiple_aliases_for_field=DEFAULT_ALLOW_MULTIPLE_ALIASES_FOR_FIELD,
-    ):
+    def render_unaliased(self, ret, converter=DEFAULT_CONVERTER):
         if converter is None:
             converter = self.converter
-        ret, __ = self.unalias(
-            data,
-            allow_unknown=allow_unknown,
-            allow_multiple_aliases_for_field=allow_multiple_aliases_for_field,
-        )
         # Allow for the existence of converters that don't return
         # {to_field: converted values} dicts, and instead simply return
         # converted values
@@ -495,7 +688,14 @@ class OneToManyFieldMap(FieldMap):
     map_type = FieldMap.ONE_TO_MANY
 
     def __init__(
-        self, from_field, to_fields, converter=DEFAULT_CONVERTER, explanation=None
+        self,
+        from_field,
+        to_fields,
+        converter=DEFAULT_CONVERTER,
+        explanation=None,
+        vectorized=False,
+        cache=False,
+        cache_size=None,
     ):
         if isinstance(from_field, dict):
             from_fields = from_field
@@ -506,6 +706,9 @@ class OneToManyFieldMap(FieldMap):
             to_fields=to_fields,
             converter=converter,
             explanation=explanation,
+            vectorized=vectorized,
+            cache=cache,
+            cache_size=cache_size,
         )
         assert len(self.from_fields) == 1, "Should only be one from field!"
         self.from_field = self.from_fields[0]
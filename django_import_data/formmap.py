@@ -8,6 +8,7 @@ from tqdm import tqdm
 from django.forms import ModelForm, ValidationError
 
 from .mermaid import render_form_map_as_mermaid
+from .validation import CompiledFormValidator
 
 LOGGER = logging.getLogger(__name__)
 DEFAULT_THRESHOLD = 0.7
@@ -48,6 +49,8 @@ class FormMap:
         check_every_render_for_errors=False,
         check_for_overloaded_to_fields=True,
         allow_fields_in_form_map_but_not_in_form=False,
+        audit_writer=None,
+        compile_validator=False,
     ):
         if form_kwargs:
             self.form_kwargs = form_kwargs
@@ -55,6 +58,14 @@ class FormMap:
             self.form_kwargs = {}
 
         self.unaliased_map = None
+        # Maps tuples of headers to the render plans compiled for them
+        self.render_plans = {}
+        # Maps tuples of headers to dicts of {to_field: aliases}; see
+        # get_error_aliases
+        self.error_aliases = {}
+        # If set, audit models will be handed to this AuditWriter to be
+        # created in bulk, instead of being created one at a time
+        self.audit_writer = audit_writer
         # self._rendered_form = None
 
         for field_map in self.field_maps:
@@ -73,6 +84,13 @@ class FormMap:
                     )
 
         self.known_fields = self.get_known_from_fields()
+        # Maps each to_field to the FieldMap that produces it. If a to_field is
+        # overloaded, the last FieldMap to produce it wins
+        self.field_maps_by_to_field = {
+            to_field: field_map
+            for field_map in self.field_maps
+            for to_field in field_map.to_fields
+        }
         # If this is set to True we will check every render call for
         # non-critical errors (such as unmapped fields). Otherwise we will check only the first
         self.check_every_render_for_errors = check_every_render_for_errors
@@ -93,10 +111,22 @@ class FormMap:
         )
         self.check_that_all_form_map_fields_are_in_form()
 
-    def render_dict(self, data, allow_unknown=True):
-        rendered = {}
-        errors = []
+        # If set, rendered data will be validated by this instead of by a
+        # fresh instance of form_class per row
+        self.validator = None
+        if compile_validator:
+            reasons = CompiledFormValidator.get_fallback_reasons(
+                self.form_class, self.form_kwargs
+            )
+            if reasons:
+                LOGGER.warning(
+                    f"Falling back to {self.form_class.__name__} for validation: "
+                    f"{pformat(reasons)}"
+                )
+            else:
+                self.validator = CompiledFormValidator(self.form_class)
 
+    def check_render_for_errors(self, data, allow_unknown=True):
         if self.check_next_render_for_errors:
             # Turn off error checking now unless user has specified
             # that we need to check every row
@@ -106,22 +136,36 @@ class FormMap:
                 unknown = self.get_unknown_fields(data)
                 raise ValueError(f"Unknown fields: {unknown}")
 
-        for field_map in self.field_maps:
-            # NOTE: We do NOT pass allow_unknown to field_map. It
-            # is essential to the functionality of our logic here
-            # that it simply ignore all values it doesn't know about
-            # Error checking is instead done above
+    def get_conversion_error(self, field_map, found_aliases, error):
+        return {
+            "error": repr(error),
+            "from_fields": field_map.from_fields,
+            "aliases": found_aliases,
+            "to_fields": field_map.to_fields,
+            "converter": field_map.converter.__name__,
+        }
+
+    def render_dict(self, data, allow_unknown=True):
+        rendered = {}
+        errors = []
+
+        self.check_render_for_errors(data, allow_unknown)
+        # NOTE: The plan simply ignores all values that its FieldMaps don't
+        # know about. Error checking is instead done above
+        for field_map, pairs, found_aliases in self.get_render_plan(tuple(data)):
             try:
-                result = field_map.render(data)
+                if field_map.overrides_render:
+                    result = field_map.render(data)
+                else:
+                    result = field_map.render_unaliased(
+                        {
+                            unaliased_field: data[alias]
+                            for alias, unaliased_field in pairs
+                        }
+                    )
             except ValueError as error:
                 errors.append(
-                    {
-                        "error": repr(error),
-                        "from_fields": field_map.from_fields,
-                        "aliases": field_map.unalias(data)[1],
-                        "to_fields": field_map.to_fields,
-                        "converter": field_map.converter.__name__,
-                    }
+                    self.get_conversion_error(field_map, found_aliases, error)
                 )
             else:
                 if result:
@@ -129,6 +173,97 @@ class FormMap:
 
         return rendered, errors
 
+    def render_dicts(self, rows, allow_unknown=True):
+        """Render the given rows column-wise; return a (rendered, errors) per row
+
+        The results are the same as those of calling render_dict on each row,
+        but each FieldMap renders all rows that share a render plan in one go.
+        This allows vectorized FieldMaps to convert entire columns at once"""
+
+        results = [({}, []) for __ in rows]
+        indices_by_headers = defaultdict(list)
+        for index, data in enumerate(rows):
+            self.check_render_for_errors(data, allow_unknown)
+            indices_by_headers[tuple(data)].append(index)
+
+        for headers, indices in indices_by_headers.items():
+            for field_map, pairs, found_aliases in self.get_render_plan(headers):
+                if field_map.overrides_render:
+                    field_map_results = [
+                        self._render_or_error(field_map, rows[index])
+                        for index in indices
+                    ]
+                else:
+                    rets = [
+                        {
+                            unaliased_field: rows[index][alias]
+                            for alias, unaliased_field in pairs
+                        }
+                        for index in indices
+                    ]
+                    field_map_results = field_map.render_many_unaliased(rets)
+                for index, result in zip(indices, field_map_results):
+                    rendered, errors = results[index]
+                    if isinstance(result, ValueError):
+                        errors.append(
+                            self.get_conversion_error(field_map, found_aliases, result)
+                        )
+                    elif result:
+                        rendered.update(result)
+
+        return results
+
+    @staticmethod
+    def _render_or_error(field_map, data):
+        try:
+            return field_map.render(data)
+        except ValueError as error:
+            return error
+
+    def get_render_plan(self, headers):
+        """Return the render plan for rows with the given tuple of headers
+
+        The plan is a list of (field_map, pairs, found_aliases) for every
+        FieldMap (see FieldMap.compile), so that rendering a row requires only
+        a lookup per consumed header rather than a pass over the entire row per
+        FieldMap. Plans are cached per distinct tuple of headers, so all rows
+        (and files) with the same layout share one"""
+
+        try:
+            return self.render_plans[headers]
+        except KeyError:
+            pass
+
+        plan = [
+            (field_map, *field_map.compile(headers)) for field_map in self.field_maps
+        ]
+        self.render_plans[headers] = plan
+        return plan
+
+    def get_error_aliases(self, headers):
+        """Return a dict of {to_field: aliases} for rows with the given headers
+
+        For each to_field, aliases is the list of headers that were consumed by
+        the FieldMap that produced it. This is derived from the render plan for
+        the headers, so it is computed only once per distinct tuple of headers"""
+
+        try:
+            return self.error_aliases[headers]
+        except KeyError:
+            pass
+
+        found_aliases_by_field_map = {
+            field_map: found_aliases
+            for field_map, __, found_aliases in self.get_render_plan(headers)
+        }
+        error_aliases = {}
+        for to_field, field_map in self.field_maps_by_to_field.items():
+            found_aliases = found_aliases_by_field_map[field_map]
+            if found_aliases:
+                error_aliases[to_field] = next(iter(found_aliases.values()))
+        self.error_aliases[headers] = error_aliases
+        return error_aliases
+
     def render(
         self,
         data,
@@ -139,9 +274,51 @@ class FormMap:
     ):
         if not self.form_class:
             raise ValueError("No FormMap.form_class defined; cannot render a form!")
+        rendered, conversion_errors = self.render_dict(data, allow_unknown)
+        return self.render_form(
+            rendered,
+            conversion_errors,
+            extra=extra,
+            allow_conversion_errors=allow_conversion_errors,
+            allow_empty_forms=allow_empty_forms,
+        )
+
+    def render_many(
+        self,
+        rows,
+        extra=None,
+        allow_unknown=True,
+        allow_conversion_errors=True,
+        allow_empty_forms=False,
+    ):
+        """Render a form for each of the given rows; return a list of render results
+
+        See render_dicts. Each result can be passed to save_with_audit (as
+        form and conversion_errors) to record it"""
+
+        if not self.form_class:
+            raise ValueError("No FormMap.form_class defined; cannot render a form!")
+        return [
+            self.render_form(
+                rendered,
+                conversion_errors,
+                extra=extra,
+                allow_conversion_errors=allow_conversion_errors,
+                allow_empty_forms=allow_empty_forms,
+            )
+            for rendered, conversion_errors in self.render_dicts(rows, allow_unknown)
+        ]
+
+    def render_form(
+        self,
+        rendered,
+        conversion_errors,
+        extra=None,
+        allow_conversion_errors=True,
+        allow_empty_forms=False,
+    ):
         if extra is None:
             extra = {}
-        rendered, conversion_errors = self.render_dict(data, allow_unknown)
         if conversion_errors:
             if allow_conversion_errors:
                 tqdm.write(f"Conversion errors: {pformat(conversion_errors)}")
@@ -153,6 +330,10 @@ class FormMap:
             #     f"No values were derived for {self.form_class}; skipping creation attempt"
             # )
             rendered_form = None
+        elif self.validator:
+            rendered_form = self.validator.bind(
+                {**self.form_defaults, **extra, **rendered}
+            )
         else:
             rendered_form = self.form_class(
                 {**self.form_defaults, **extra, **rendered}, **self.form_kwargs
@@ -161,33 +342,27 @@ class FormMap:
         return (rendered_form, conversion_errors)
 
     def get_useful_form_errors(self, form, data):
-        useful_form_errors = []
-        for field, errors in form.errors.as_data().items():
-            alias = None
-            # TODO: Cache this up front somehow
-            for field_map in self.field_maps:
-                if field in field_map.to_fields:
-                    try:
-                        # TODO: This is disgusting
-                        alias = next(iter(field_map.unalias(data)[1].values()))
-                    except:
-                        LOGGER.error(
-                            "Failed to process alias for:", field_map.unalias(data)
-                        )
-
-            useful_form_errors.append(
-                {
-                    "field": field,
-                    "value": form[field].value(),
-                    "errors": [repr(error) for error in errors],
-                    "alias": alias if alias else field,
-                }
-            )
-
-        return useful_form_errors
+        error_aliases = self.get_error_aliases(tuple(data))
+        return [
+            {
+                "field": field,
+                "value": form[field].value(),
+                "errors": [repr(error) for error in errors],
+                "alias": error_aliases.get(field, field),
+            }
+            for field, errors in form.errors.as_data().items()
+        ]
 
     def save_with_audit(
-        self, row_data, data=None, form=None, imported_by=None, **kwargs
+        self,
+        row_data,
+        data=None,
+        form=None,
+        conversion_errors=None,
+        imported_by=None,
+        audit_writer=None,
+        depends_on=None,
+        **kwargs,
     ):
         from django.contrib.contenttypes.models import ContentType
         from django_import_data.models import ModelImporter
@@ -199,12 +374,30 @@ class FormMap:
         if not isinstance(row_data, RowData):
             raise ValueError(f"row_data must be a {RowData} instance!")
 
+        if audit_writer is None:
+            audit_writer = self.audit_writer
+        defer_importees = audit_writer is not None and audit_writer.defer_importees
+
+        # depends_on is a dict of {field: instance} for instances (created by
+        # other FormMaps) that our instance must reference
+        if depends_on and not defer_importees:
+            kwargs["extra"] = {
+                **(kwargs.get("extra") or {}),
+                **{
+                    field: dependency.id if dependency else None
+                    for field, dependency in depends_on.items()
+                },
+            }
+
         # If no data has been explicitly given, use the whole row's data
         if data is None:
             data = row_data.data
 
         if form is not None:
-            conversion_errors = {}
+            # If form was rendered via render_many, its conversion errors
+            # should have been given along with it
+            if conversion_errors is None:
+                conversion_errors = {}
         else:
             # Thus, if it is _not_ a ModelForm instance, we need to render it
             # ourselves
@@ -214,6 +407,21 @@ class FormMap:
 
         LOGGER.debug(f"Form data: {form.data}")
 
+        if depends_on and defer_importees:
+            # Deferred dependencies don't have PKs yet, so they can't be given
+            # to the form; they are only set once the writer is flushed
+            required_fields = [
+                field
+                for field in depends_on
+                if field in form.fields and form.fields[field].required
+            ]
+            if required_fields:
+                raise ValueError(
+                    f"{required_fields} can't be deferred dependencies of "
+                    f"{type(self).__name__}: {type(form).__name__} requires them. "
+                    "Make them optional in the form (or exclude them from it)"
+                )
+
         useful_form_errors = self.get_useful_form_errors(form, data)
 
         all_errors = {}
@@ -222,32 +430,50 @@ class FormMap:
         if useful_form_errors:
             all_errors["form_errors"] = useful_form_errors
 
+        audit_kwargs = dict(
+            errors=all_errors,
+            imported_by=imported_by,
+            importee_field_data=form.data,
+            model=form.Meta.model,
+            row_data=row_data,
+        )
         # if conversion_errors and useful_form_errors:
         if not (conversion_errors or useful_form_errors):
-            __, model_import_attempt = ModelImporter.objects.create_with_attempt(
-                errors=all_errors,
-                imported_by=imported_by,
-                importee_field_data=form.data,
-                model=form.Meta.model,
-                row_data=row_data,
-            )
             instance = form.save(commit=False)
             if "original_pk" in form.data:
                 instance.pk = form.data["original_pk"]
-            instance.model_import_attempt = model_import_attempt
-            instance.save()
+            if defer_importees:
+                # Neither the instance nor its MIA will exist until the writer
+                # is flushed, at which point its dependencies are also resolved
+                __, model_import_attempt = audit_writer.add(
+                    instance=instance, depends_on=depends_on, **audit_kwargs
+                )
+                return instance, model_import_attempt
+
+            if audit_writer is None:
+                __, model_import_attempt = ModelImporter.objects.create_with_attempt(
+                    **audit_kwargs
+                )
+                instance.model_import_attempt = model_import_attempt
+                instance.save()
+            else:
+                # The MIA won't exist until the writer is flushed, so save the
+                # instance now and let the writer link the two together later
+                instance.save()
+                __, model_import_attempt = audit_writer.add(
+                    instance=instance, **audit_kwargs
+                )
             instance.refresh_from_db()
             if "original_pk" in form.data:
                 assert instance.id == form.data["original_pk"], "Aw man"
             return instance, model_import_attempt
 
-        __, model_import_attempt = ModelImporter.objects.create_with_attempt(
-            errors=all_errors,
-            imported_by=imported_by,
-            importee_field_data=form.data,
-            model=form.Meta.model,
-            row_data=row_data,
-        )
+        if audit_writer is None:
+            __, model_import_attempt = ModelImporter.objects.create_with_attempt(
+                **audit_kwargs
+            )
+        else:
+            __, model_import_attempt = audit_writer.add(**audit_kwargs)
         return None, model_import_attempt
 
     # TODO: handle common functionality
@@ -276,6 +502,15 @@ class FormMap:
             f"{self.form_class.__name__} is invalid; couldn't be saved! {all_errors}"
         )
 
+    def get_converter_stats(self):
+        """Return {converter name: cache stats} for all cached converters"""
+
+        return {
+            field_map.converter_name: field_map.get_converter_stats()
+            for field_map in self.field_maps
+            if field_map.get_converter_stats() is not None
+        }
+
     def get_known_from_fields(self):
         """Return set of all known from_fields, including aliases thereof"""
 
@@ -0,0 +1,111 @@
+"""Provides FileHashCache: a cache of file hashes, keyed by stat identity"""
+
+import os
+import sqlite3
+import threading
+
+from django.conf import settings
+
+from django_import_data.utils import hash_file
+
+
+class FileHashCache:
+    """Caches the SHA-1 hashes of files
+
+    Hashes are keyed on the (device, inode, size, mtime_ns) of each file, so a
+    file is only re-read if its contents have (probably) changed. Hashes are
+    always cached in memory. If path is given, they are also persisted to a
+    SQLite database at that path, so that they are kept between runs.
+
+    This is safe to use from multiple threads, and from forked processes (each
+    of which opens its own connection to the SQLite database)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hashes = {}
+        self.lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    @property
+    def connection(self):
+        if not self.path:
+            return None
+
+        # SQLite connections must not be shared across a fork
+        if self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection_pid = os.getpid()
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS file_hashes ("
+                    "device INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, "
+                    "hash TEXT, PRIMARY KEY (device, inode, size, mtime_ns))"
+                )
+        return self._connection
+
+    @staticmethod
+    def get_key(stat_result):
+        return (
+            stat_result.st_dev,
+            stat_result.st_ino,
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+        )
+
+    def get(self, key):
+        """Return the cached hash for the given key, or None if there isn't one"""
+
+        with self.lock:
+            file_hash = self.hashes.get(key, None)
+            if file_hash is None and self.connection:
+                row = self.connection.execute(
+                    "SELECT hash FROM file_hashes WHERE "
+                    "device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                    key,
+                ).fetchone()
+                if row:
+                    file_hash = self.hashes[key] = row[0]
+        return file_hash
+
+    def set(self, key, file_hash):
+        with self.lock:
+            self.hashes[key] = file_hash
+            if self.connection:
+                with self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)",
+                        (*key, file_hash),
+                    )
+
+    def hash_file(self, path, stat_result=None):
+        """Return the SHA-1 hash of the file at path, from the cache if possible
+
+        If the result of os.stat(path) is already known, it can be given as
+        stat_result to save a syscall"""
+
+        if stat_result is None:
+            stat_result = os.stat(path)
+        key = self.get_key(stat_result)
+        file_hash = self.get(key)
+        if file_hash is None:
+            file_hash = hash_file(path)
+            self.set(key, file_hash)
+        return file_hash
+
+
+_HASH_CACHE = None
+
+
+def get_hash_cache():
+    """Return the FileHashCache shared by everything in this process
+
+    If the DJANGO_IMPORT_DATA_HASH_CACHE_PATH setting is given, hashes are
+    persisted to a SQLite database at that path"""
+    global _HASH_CACHE
+
+    if _HASH_CACHE is None:
+        _HASH_CACHE = FileHashCache(
+            getattr(settings, "DJANGO_IMPORT_DATA_HASH_CACHE_PATH", None)
+        )
+    return _HASH_CACHE
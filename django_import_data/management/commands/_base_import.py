@@ -1,28 +1,76 @@
 """Provides BaseImportCommand: an abstract class for creating Importers"""
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from itertools import islice
 from enum import Enum
 from pprint import pformat
 import csv
 import json
 import logging
+import multiprocessing
 import os
 import random
 import re
 
 from django.apps import apps
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connections, transaction
 from django.db.models import Count, F, Q
 from django.utils import timezone
 
 from tqdm import tqdm
 
-from django_import_data.utils import hash_file, determine_files_to_process
+from django_import_data.hashcache import get_hash_cache
+from django_import_data.propagation import defer_propagation, deferred_propagation
+from django_import_data.utils import (
+    chunked,
+    determine_files_to_process,
+    find_duplicate_files,
+    peek,
+    reservoir_sample,
+)
+from django_import_data.writers import AuditWriter
 
 LOGGER = logging.getLogger(__name__)
 
+# The ways in which RowData can be created; see create_row_datas
+INGEST_CREATE = "create"
+INGEST_BULK = "bulk"
+INGEST_COPY = "copy"
+INGEST_METHODS = (INGEST_CREATE, INGEST_BULK, INGEST_COPY)
+
+# Set by BaseImportCommand.handle_files_in_parallel just before the worker
+# processes are forked, so that they inherit it (instead of it being pickled):
+# (command, file_importer_batch_id, options)
+_WORKER_STATE = None
+
+
+def _handle_file_in_worker(path):
+    """Handle the file at path in a worker process; return the ID of its FIA"""
+
+    command, file_importer_batch_id, options = _WORKER_STATE
+    FileImporterBatch = apps.get_model("django_import_data.FileImporterBatch")
+    file_importer_batch = FileImporterBatch.objects.get(id=file_importer_batch_id)
+    # Each file gets its own transaction, on this worker's own connection
+    # (unless transactions are being managed by handle_file itself, which only
+    # chunks by rows for row-based importers; file-based importers chunk by
+    # files, which can't be done across workers)
+    rows_are_chunked = (
+        command.PROGRESS_TYPE == command.PROGRESS_TYPES.ROW and options["commit_every"]
+    )
+    if options["no_transaction"] or rows_are_chunked:
+        context = nullcontext()
+    else:
+        context = transaction.atomic()
+    propagation = deferred_propagation if options["propagate"] else nullcontext
+    with context, propagation():
+        file_import_attempt = command.handle_file(path, file_importer_batch, **options)
+    return file_import_attempt.id if file_import_attempt else None
+
 
 class BaseImportCommand(BaseCommand):
     # output will automatically be wrapped with BEGIN; and COMMIT;
@@ -56,6 +104,17 @@ class BaseImportCommand(BaseCommand):
                 "this will leave gaps in the PKs where created objects were rolled back"
             ),
         )
+        parser.add_argument(
+            "--fast-delete",
+            action="store_true",
+            help=(
+                "When previously imported models are deleted (see --overwrite and "
+                "--incremental), delete them via set-based DELETEs instead of "
+                "fetching them (and everything that cascades from them) first. "
+                "Models with deletion signal receivers, or relations that need "
+                "them to be fetched, are still deleted the normal way"
+            ),
+        )
         parser.add_argument(
             "-D", "--durable", action="store_true", help="Continue past record errors"
         )
@@ -77,6 +136,30 @@ class BaseImportCommand(BaseCommand):
                 "of the given paths, skip it"
             ),
         )
+        group.add_argument(
+            "--resume",
+            action="store_true",
+            help=(
+                "If a previous, incomplete File Import Attempt (see --commit-every) "
+                "is detected for one or more of the given paths, continue it from "
+                "its last checkpoint. Completed File Import Attempts are skipped, "
+                "and those whose file has changed since are deleted and redone. "
+                "Rows are only guaranteed to line up with the checkpoint if the "
+                "same row selection arguments are given as in the original run"
+            ),
+        )
+        group.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "If a previous File Import Attempt is detected for one or more of the "
+                "given paths, compare its rows to those now in the file. Only rows "
+                "that have been added or changed are imported; models imported from "
+                "rows that have been changed or removed are deleted, and unchanged "
+                "rows (along with their models) are carried forward. The whole file "
+                "is always processed, so row selection arguments cannot be given"
+            ),
+        )
 
         parser.add_argument(
             "-l",
@@ -125,8 +208,9 @@ class BaseImportCommand(BaseCommand):
             action="store_true",
             help=(
                 "This will cause derived values to be derived and propagated "
-                "as audit models are created. If not given, it is assumed that "
-                "these will be derived at the end."
+                "as audit models are created (in bulk, as each file is "
+                "completed). If not given, it is assumed that these will be "
+                "derived at the end."
             ),
         )
         parser.add_argument(
@@ -137,6 +221,83 @@ class BaseImportCommand(BaseCommand):
                 "This might be used if you plan on performing post-import actions yourself"
             ),
         )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help=(
+                "Stream rows from each file instead of loading them all into memory "
+                "up front, so that memory usage does not grow with file size. "
+                "Note that --limit requires an extra pass over each file in this mode"
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help=(
+                "If given, rows will be processed in batches of this size, and the "
+                "Row Data for each batch will be created via a single bulk INSERT "
+                "(instead of one INSERT per row)"
+            ),
+        )
+        parser.add_argument(
+            "--ingest",
+            choices=INGEST_METHODS,
+            help=(
+                "How Row Data are created: one INSERT per row (create), a single "
+                "bulk INSERT per batch (bulk), or a single Postgres COPY per batch "
+                "(copy), which is fastest for large batches. Defaults to bulk if "
+                "--batch-size is given, otherwise create"
+            ),
+        )
+        parser.add_argument(
+            "--compact-rows",
+            action="store_true",
+            help=(
+                "If given, the headers of each file are stored once, on its File "
+                "Import Attempt, and each Row Data stores only its values (in "
+                "header order) instead of a full header-to-value mapping"
+            ),
+        )
+        parser.add_argument(
+            "--bulk-audit",
+            action="store_true",
+            help=(
+                "If given, Model Importers and Model Import Attempts will be queued "
+                "up and created in bulk at the end of each batch of rows "
+                "(see --batch-size), instead of being created one at a time"
+            ),
+        )
+        parser.add_argument(
+            "--defer-importees",
+            action="store_true",
+            help=(
+                "Implies --bulk-audit. If given, the imported models themselves will "
+                "also be queued up and created in bulk at the end of each batch of "
+                "rows. Note that post_save signals are not sent for these models"
+            ),
+        )
+        parser.add_argument(
+            "--commit-every",
+            type=int,
+            help=(
+                "If given, commit after every N rows (or, for file-based importers, "
+                "every N files, or every file if --workers is given) instead of in "
+                "one transaction for the whole import. "
+                "The last committed row of each File Import Attempt is recorded as "
+                "a checkpoint, so that an interrupted import can be continued via "
+                "--resume. Cannot be used with --dry-run or --no-transaction"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Number of worker processes to import files with. If greater than 1, "
+                "each file is imported in its own transaction, in one of the workers. "
+                "Cannot be used with --dry-run"
+            ),
+        )
 
         if cls.PROGRESS_TYPE == cls.PROGRESS_TYPES.ROW:
             parser.add_argument(
@@ -160,12 +321,126 @@ class BaseImportCommand(BaseCommand):
     # both with important information
     @staticmethod
     def load_rows(path):
-        """Load rows from a CSV file"""
+        """Lazily load rows from a CSV file"""
         with open(path, newline="", encoding="latin1") as file:
-            lines = file.readlines()
+            yield from csv.DictReader(file)
 
-        LOGGER.debug(f"Read {len(lines)} lines from {path}")
-        return csv.DictReader(lines)
+    def create_row_datas(self, rows, file_import_attempt, ingest=INGEST_CREATE):
+        """Create a RowData for each of the given (row_num, row) pairs
+
+        ingest determines how they are created:
+            INGEST_CREATE: one INSERT per RowData
+            INGEST_BULK: a single bulk INSERT
+            INGEST_COPY: a single COPY ... FROM STDIN
+        NOTE: Both bulk methods rely on PKs being available after creation (via
+        RETURNING or the sequence, respectively), since handle_record needs them!"""
+
+        RowData = apps.get_model("django_import_data.RowData")
+        row_datas = []
+        for row_num, row in rows:
+            row_data = RowData(
+                row_num=row_num,
+                content_hash=RowData.hash_data(row),
+                file_import_attempt=file_import_attempt,
+            )
+            # If the FIA has headers, rows are stored compactly
+            row_data.set_data(row, file_import_attempt.headers)
+            row_datas.append(row_data)
+
+        if ingest == INGEST_CREATE:
+            for row_data in row_datas:
+                row_data.save()
+            return row_datas
+        if ingest == INGEST_COPY:
+            row_datas = RowData.objects.copy_create(row_datas)
+        elif ingest == INGEST_BULK:
+            row_datas = RowData.objects.bulk_create(row_datas)
+        else:
+            raise ValueError(f"Invalid ingest method: {ingest!r}")
+        # Neither bulk method calls save(), so mark the RDs dirty ourselves (if
+        # propagation is being deferred)
+        for row_data in row_datas:
+            defer_propagation(row_data)
+        return row_datas
+
+    def diff_rows(self, rows, previous_file_import_attempt, fast_delete=False):
+        """Compare the given rows to those of previous_file_import_attempt
+
+        Models imported from previous rows that are no longer present in rows
+        (i.e. that have been changed or removed) are deleted (via fast_delete,
+        if fast_delete is True), and the previous FIA is marked as deleted.
+        Return a dict of {content_hash: [RD IDs]} for the previous rows that
+        are still present, and can be carried forward"""
+
+        RowData = apps.get_model("django_import_data.RowData")
+        row_hash_counts = Counter(RowData.hash_data(row) for row in rows)
+        unchanged = defaultdict(list)
+        removed = []
+        previous_row_datas = previous_file_import_attempt.row_datas.order_by("row_num")
+        for row_data_id, content_hash in previous_row_datas.values_list(
+            "id", "content_hash"
+        ):
+            # Identical rows can appear more than once, so they must be
+            # matched up one-for-one
+            if row_hash_counts[content_hash] > 0:
+                row_hash_counts[content_hash] -= 1
+                unchanged[content_hash].append(row_data_id)
+            else:
+                removed.append(row_data_id)
+
+        num_deletions, deletions = RowData.objects.filter(
+            id__in=removed
+        ).delete_imported_models(fast=fast_delete)
+        LOGGER.debug(
+            f"{len(removed)} rows changed or removed since FIA "
+            f"{previous_file_import_attempt.id}; deleted {num_deletions} models:\n"
+            f"{pformat(deletions)}"
+        )
+        if self.verbosity > 2:
+            tqdm.write(
+                f"Carrying forward {sum(len(ids) for ids in unchanged.values())} "
+                f"unchanged rows; deleted {num_deletions} models from "
+                f"{len(removed)} changed or removed rows"
+            )
+        previous_file_import_attempt.current_status = (
+            previous_file_import_attempt.CURRENT_STATUSES.deleted.db_value
+        )
+        previous_file_import_attempt.save()
+        return unchanged
+
+    def carry_forward_row_datas(self, row_datas, rewrite_data=False):
+        """Move the given (unsaved, but with IDs) RDs to their new FIA/row_num
+
+        If rewrite_data is True, their data is also re-saved. This is necessary
+        if either FIA stores its rows compactly, since the values of a compact
+        row are only meaningful alongside the headers of its own FIA"""
+
+        FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
+        RowData = apps.get_model("django_import_data.RowData")
+        # The FIAs that these RDs are leaving will have stale condensed errors
+        FileImportAttempt.objects.filter(
+            row_datas__in=[row_data.id for row_data in row_datas]
+        ).update(condensed_errors=None)
+        fields = ["row_num", "file_import_attempt"]
+        if rewrite_data:
+            fields += ["raw_data", "values"]
+        RowData.objects.bulk_update(row_datas, fields)
+        row_datas.clear()
+
+    @contextmanager
+    def using_audit_writer(self, audit_writer):
+        """Hand the given AuditWriter to all FORM_MAPS for the duration"""
+
+        previous_audit_writers = [form_map.audit_writer for form_map in self.FORM_MAPS]
+        for form_map in self.FORM_MAPS:
+            form_map.audit_writer = audit_writer
+        try:
+            yield audit_writer
+        finally:
+            for form_map, previous_audit_writer in zip(
+                self.FORM_MAPS, previous_audit_writers
+            ):
+                form_map.audit_writer = previous_audit_writer
 
     def handle_record(self, record, file_import_attempt):
         """Provides logic for importing individual records"""
@@ -173,17 +448,8 @@ class BaseImportCommand(BaseCommand):
         raise NotImplementedError("Must be implemented by child class")
 
     def check_for_duplicates(self, paths):
-        hash_to_path_map = defaultdict(list)
         tqdm.write("Checking for duplicates...")
-        progress = tqdm(paths, unit="file")
-        for path in progress:
-            progress.desc = f"Hashing {path}"
-            file_hash = hash_file(path)
-            hash_to_path_map[file_hash].append(path)
-
-        return {
-            hash_: paths for hash_, paths in hash_to_path_map.items() if len(paths) > 1
-        }
+        return find_duplicate_files(paths, hash_cache=get_hash_cache())
 
     def determine_records_to_process(
         self,
@@ -192,17 +458,33 @@ class BaseImportCommand(BaseCommand):
         limit=None,
         start_index=START_INDEX_DEFAULT,
         end_index=END_INDEX_DEFAULT,
+        num_records=None,
     ):
         """Return subset of given records
 
         First, a slice is taken using `start_index` and `end_index`.
         Then, if limit is given, if is used to randomly select a further subset
         of records
+
+        If records is not a Sequence (i.e. it is a stream of rows), it is never
+        materialized: the slice is taken lazily, and the random subset is
+        selected via reservoir sampling. In this case num_records (the total
+        number of records in the stream) must be given in order to use limit
         """
 
         if rows_to_process and limit:
             raise ValueError("Cannot give both rows_to_process and limit!")
 
+        if not isinstance(records, Sequence):
+            return self._determine_records_to_process_from_stream(
+                records,
+                rows_to_process=rows_to_process,
+                limit=limit,
+                start_index=start_index,
+                end_index=end_index,
+                num_records=num_records,
+            )
+
         if rows_to_process:
             return [records[index] for index in rows_to_process]
 
@@ -228,6 +510,47 @@ class BaseImportCommand(BaseCommand):
 
         return sliced
 
+    def _determine_records_to_process_from_stream(
+        self,
+        records,
+        rows_to_process=None,
+        limit=None,
+        start_index=START_INDEX_DEFAULT,
+        end_index=END_INDEX_DEFAULT,
+        num_records=None,
+    ):
+        if rows_to_process:
+            wanted = set(rows_to_process)
+            found = {
+                index: record
+                for index, record in enumerate(
+                    islice(records, max(rows_to_process) + 1)
+                )
+                if index in wanted
+            }
+            try:
+                return [found[index] for index in rows_to_process]
+            except KeyError as error:
+                raise IndexError(f"Record index {error} is out of range") from error
+
+        sliced = islice(records, start_index, end_index)
+
+        if limit is not None and limit < 1:
+            if num_records is None:
+                raise ValueError(
+                    "num_records must be given in order to use limit on a stream of records"
+                )
+            num_sliced = len(range(num_records)[start_index:end_index])
+            # Determine how many records we want to return
+            goal = int(num_sliced * limit)
+            # Ensure that there is always at least one record returned
+            if goal < 1:
+                goal = 1
+
+            return reservoir_sample(sliced, goal)
+
+        return sliced
+
     def get_known_headers(self,):
         known_headers = set()
         for form_map in self.FORM_MAPS:
@@ -284,6 +607,9 @@ class BaseImportCommand(BaseCommand):
         return info, errors
 
     def file_level_checks(self, rows):
+        """Check the given rows for file-level errors
+
+        NOTE: When streaming, only the first row is given"""
         info = {}
         errors = {}
         if not rows:
@@ -302,17 +628,20 @@ class BaseImportCommand(BaseCommand):
         LOGGER.debug(f"Handling path {path}")
         FileImporter = apps.get_model("django_import_data.FileImporter")
         FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
-        RowData = apps.get_model("django_import_data.RowData")
         # TODO: How to handle changes in path? That is, if a Batch file is moved
         # somewhere else we still need a way to force its association with the
         # existing Batch in the DB. Allow explicit Batch ID to be passed in?
         # Some other unique ID?
         current_command = self.__module__.split(".")[-1]
         try:
+            stat_result = os.stat(path)
             file_modified_on = timezone.make_aware(
-                datetime.fromtimestamp(os.path.getmtime(path))
+                datetime.fromtimestamp(stat_result.st_mtime)
             )
-            hash_on_disk = hash_file(path)
+            # This is only a cache hit if the file was hashed by a previous run
+            # (with a persistent cache), or fully hashed by check_for_duplicates
+            # (which only does so for possible duplicates)
+            hash_on_disk = get_hash_cache().hash_file(path, stat_result)
             LOGGER.debug(f"Found {path}; hash: {hash_on_disk}")
         except FileNotFoundError:
             file_modified_on = None
@@ -363,7 +692,35 @@ class BaseImportCommand(BaseCommand):
             LOGGER.debug(
                 f"Found previous FileImportAttempt: FIA {latest_file_import_attempt.id}"
             )
-            if options["overwrite"] or options["skip"]:
+            if options["resume"]:
+                if latest_file_import_attempt.checkpoint is None:
+                    LOGGER.debug(f"Previous FIA is complete; skipping {path}")
+                    if self.verbosity > 2:
+                        tqdm.write(
+                            f"SKIPPING completed FIA: {latest_file_import_attempt}"
+                        )
+                    return latest_file_import_attempt
+                if latest_file_import_attempt.hash_when_imported != hash_on_disk:
+                    # Resuming would splice the rest of the file's new contents
+                    # onto rows from its old contents, so start over instead
+                    tqdm.write(
+                        f"{path} has changed since FIA {latest_file_import_attempt.id} "
+                        "was interrupted; deleting it and starting over"
+                    )
+                    num_deletions, deletions = (
+                        latest_file_import_attempt.delete_imported_models(
+                            fast=options["fast_delete"]
+                        )
+                    )
+                    LOGGER.debug(
+                        f"Deleted {num_deletions} models:\n{pformat(deletions)}"
+                    )
+                    latest_file_import_attempt = None
+            elif options["incremental"]:
+                LOGGER.debug(
+                    f"Incrementally updating previous FIA {latest_file_import_attempt.id}"
+                )
+            elif options["overwrite"] or options["skip"]:
                 if options["skip"]:
                     LOGGER.debug(f"Skipping processing of {path}")
                     if self.verbosity > 2:
@@ -381,7 +738,9 @@ class BaseImportCommand(BaseCommand):
                             f"DELETING previous FIA: {latest_file_import_attempt}"
                         )
                     num_deletions, deletions = (
-                        latest_file_import_attempt.delete_imported_models()
+                        latest_file_import_attempt.delete_imported_models(
+                            fast=options["fast_delete"]
+                        )
                     )
                     LOGGER.debug(
                         f"Deleted {num_deletions} models:\n{pformat(deletions)}"
@@ -398,7 +757,11 @@ class BaseImportCommand(BaseCommand):
 
         file_level_errors = {}
         try:
-            rows = list(self.load_rows(path))
+            if options["stream"]:
+                first_row, rows = peek(self.load_rows(path))
+            else:
+                rows = list(self.load_rows(path))
+                first_row = rows[0] if rows else None
         except (FileNotFoundError, ValueError) as error:
             if options["durable"]:
                 tqdm.write(f"ERROR: {error}")
@@ -409,9 +772,15 @@ class BaseImportCommand(BaseCommand):
             else:
                 raise ValueError("Error loading rows!") from error
             rows = []
+            first_row = None
 
-        LOGGER.debug(f"Got {len(rows)} rows from {path}")
-        file_level_info, more_file_level_errors = self.file_level_checks(rows)
+        if options["stream"]:
+            file_level_info, more_file_level_errors = self.file_level_checks(
+                [first_row] if first_row is not None else []
+            )
+        else:
+            LOGGER.debug(f"Got {len(rows)} rows from {path}")
+            file_level_info, more_file_level_errors = self.file_level_checks(rows)
         file_level_errors.update(more_file_level_errors)
         if not os.path.isfile(path):
             if "misc" in file_level_errors:
@@ -421,31 +790,82 @@ class BaseImportCommand(BaseCommand):
         if file_level_errors and not options["durable"]:
             raise ValueError(f"One or more file-level errors: {file_level_errors}")
 
-        file_import_attempt = FileImportAttempt.objects.create(
-            file_importer=file_importer,
-            imported_from=path,
-            info=file_level_info,
-            errors=file_level_errors,
-            imported_by=self.__module__,
-            hash_when_imported=hash_on_disk,
-        )
+        # Rows are only committed in chunks by row-based importers; file-based
+        # importers commit in chunks of files instead (see handle_files)
+        if self.PROGRESS_TYPE != self.PROGRESS_TYPES.FILE:
+            commit_every = options["commit_every"]
+        else:
+            commit_every = None
+        # Compact rows store only their values; their headers are stored (once)
+        # on the FIA. Non-string headers wouldn't survive that round trip
+        if (
+            options["compact_rows"]
+            and first_row
+            and all(isinstance(header, str) for header in first_row)
+        ):
+            headers = list(first_row)
+        else:
+            headers = None
+        resuming = bool(options["resume"] and latest_file_import_attempt)
+        if resuming:
+            # We've already established that this FIA is incomplete
+            file_import_attempt = latest_file_import_attempt
+            file_import_attempt.info = file_level_info
+            file_import_attempt.errors.update(file_level_errors)
+            file_import_attempt.hash_when_imported = hash_on_disk
+            if headers and not file_import_attempt.headers:
+                # Compact rows may be committed before the FIA is next saved
+                file_import_attempt.headers = headers
+                FileImportAttempt.objects.filter(id=file_import_attempt.id).update(
+                    headers=headers
+                )
+        else:
+            file_import_attempt = FileImportAttempt.objects.create(
+                file_importer=file_importer,
+                file_importer_batch=file_importer_batch,
+                imported_from=path,
+                info=file_level_info,
+                errors=file_level_errors,
+                imported_by=self.__module__,
+                hash_when_imported=hash_on_disk,
+                headers=headers,
+                # Row 1 is the header, so nothing has been committed yet
+                checkpoint=1 if commit_every else None,
+            )
+        if options["incremental"] and latest_file_import_attempt:
+            # Streamed rows can only be read once, so do a separate pass
+            unchanged_row_datas = self.diff_rows(
+                rows if isinstance(rows, Sequence) else self.load_rows(path),
+                latest_file_import_attempt,
+                fast_delete=options["fast_delete"],
+            )
+        else:
+            unchanged_row_datas = None
+
         if self.PROGRESS_TYPE == self.PROGRESS_TYPES.ROW:
             rows_to_process = options.get("rows", None)
             limit = options.get("limit", None)
             start_index = options.get("start_index", None)
             end_index = options.get("end_index", None)
+            num_records = None
+            if not isinstance(rows, Sequence) and limit is not None and limit < 1:
+                # We can't know how many rows a stream has without reading
+                # it, so do a separate counting pass (which still doesn't
+                # hold more than one row in memory at a time)
+                num_records = sum(1 for __ in self.load_rows(path))
             rows = self.determine_records_to_process(
                 rows,
                 rows_to_process=rows_to_process,
                 limit=limit,
                 start_index=start_index,
                 end_index=end_index,
+                num_records=num_records,
             )
 
             if rows_to_process:
                 tqdm.write(f"Processing only rows {rows_to_process}")
 
-            if limit is not None:
+            if limit is not None and isinstance(rows, Sequence):
                 # if start_index != self.START_INDEX_DEFAULT or end_index != self.END_INDEX_DEFAULT:
                 #     slice_str =
                 tqdm.write(
@@ -454,39 +874,87 @@ class BaseImportCommand(BaseCommand):
                 )
             rows = tqdm(rows, desc=self.help, unit="rows")
 
-        all_errors = []
+        batch_size = options["batch_size"]
+        if options["bulk_audit"] or options["defer_importees"]:
+            audit_writer = AuditWriter(defer_importees=options["defer_importees"])
+        else:
+            audit_writer = None
 
         # TODO: Excel logic of adding a column with original row needs to be here, then removed there?
         # We start at 2 here:
         # +1 to make it 1-indexed (more intuitive for end user)
         # +1 to compensate for header being the first row
         # TODO: This is NOT robust across all use cases! Should be defined in the importer_spec.json/CLI, worst case...
-        for ri, row in enumerate(rows, 2):
-            row_data = RowData.objects.create(
-                row_num=ri, data=row, file_import_attempt=file_import_attempt
+        numbered_rows = enumerate(rows, 2)
+        if resuming:
+            tqdm.write(
+                f"Resuming FIA {file_import_attempt.id} after row "
+                f"{file_import_attempt.checkpoint}"
+            )
+            numbered_rows = (
+                (row_num, row)
+                for row_num, row in numbered_rows
+                if row_num > file_import_attempt.checkpoint
             )
-            self.handle_record(row_data, durable=options["durable"])
-            errors = {
-                model_importer.latest_model_import_attempt.imported_by: model_importer.latest_model_import_attempt.errors
-                for model_importer in row_data.model_importers.all()
-                if model_importer.latest_model_import_attempt.errors
-            }
-            if errors:
-                error_str = (
-                    f"Row {ri} of file {os.path.basename(path)} handled, but had {len(errors)} errors:\n"
-                    f"{json.dumps(errors, indent=2)}"
-                )
-                if options["durable"]:
-                    tqdm.write(error_str)
-                else:
-                    raise ValueError(error_str)
 
-                all_errors.append(errors)
+        carried_forward = []
+        rewrite_data = False
+        if unchanged_row_datas is not None:
+            RowData = apps.get_model("django_import_data.RowData")
+            rewrite_data = bool(
+                file_import_attempt.headers or latest_file_import_attempt.headers
+            )
+
+            def skip_unchanged_rows(numbered_rows):
+                for row_num, row in numbered_rows:
+                    row_data_ids = unchanged_row_datas.get(RowData.hash_data(row))
+                    if row_data_ids:
+                        row_data = RowData(
+                            id=row_data_ids.pop(0),
+                            row_num=row_num,
+                            file_import_attempt=file_import_attempt,
+                        )
+                        if rewrite_data:
+                            row_data.set_data(row, file_import_attempt.headers)
+                        carried_forward.append(row_data)
+                    else:
+                        yield row_num, row
+
+            numbered_rows = skip_unchanged_rows(numbered_rows)
 
-        creations, errors = self.summary(file_import_attempt, all_errors)
+        if commit_every:
+            chunks = chunked(numbered_rows, commit_every)
+        else:
+            chunks = [numbered_rows]
+        with self.using_audit_writer(audit_writer):
+            for chunk in chunks:
+                with transaction.atomic() if commit_every else nullcontext():
+                    for batch in chunked(chunk, batch_size if batch_size else 1):
+                        self.handle_batch(
+                            batch, file_import_attempt, audit_writer, path, **options
+                        )
+                    if carried_forward:
+                        self.carry_forward_row_datas(carried_forward, rewrite_data)
+                    if commit_every:
+                        # Record that all rows up to (and including) the last
+                        # row of this chunk are about to be committed
+                        file_import_attempt.checkpoint = chunk[-1][0]
+                        FileImportAttempt.objects.filter(
+                            id=file_import_attempt.id
+                        ).update(checkpoint=file_import_attempt.checkpoint)
+
+        # Any unchanged rows after the last changed row still need carrying
+        if carried_forward:
+            self.carry_forward_row_datas(carried_forward, rewrite_data)
+        # All rows have been handled, so there is nothing left to resume
+        file_import_attempt.checkpoint = None
+        creations, errors = self.summary(file_import_attempt)
         file_import_attempt.creations = creations
         file_import_attempt.errors.update(errors)
         file_import_attempt.ignored_headers = self.IGNORED_HEADERS
+        file_import_attempt.condensed_errors = (
+            file_import_attempt.derive_condensed_errors()
+        )
         file_import_attempt.save(
             propagate_derived_values=options["propagate"],
             derive_cached_values=options["propagate"],
@@ -495,7 +963,43 @@ class BaseImportCommand(BaseCommand):
 
         # raise ValueError("hmmm")
 
-    def summary(self, file_import_attempt, all_errors):
+    def handle_batch(self, batch, file_import_attempt, audit_writer, path, **options):
+        """Handle the given batch of (row_num, row) pairs"""
+
+        ingest = options["ingest"]
+        if not ingest:
+            ingest = INGEST_BULK if options["batch_size"] else INGEST_CREATE
+        row_datas = self.create_row_datas(batch, file_import_attempt, ingest=ingest)
+        for row_data in row_datas:
+            self.handle_record(row_data, durable=options["durable"])
+
+        # Audit models must exist before we can check them for errors
+        if audit_writer:
+            audit_writer.flush()
+
+        for row_data in row_datas:
+            # Every MIA created via create_with_attempt (or an AuditWriter) is
+            # recorded in audit_results, so a row without any (e.g. an empty or
+            # skipped row) has no errors
+            errors = {
+                model_import_attempt.imported_by: model_import_attempt.errors
+                for model_import_attempt in row_data.audit_results
+                if model_import_attempt.errors
+            }
+            if errors:
+                error_str = (
+                    f"Row {row_data.row_num} of file {os.path.basename(path)} handled, but had {len(errors)} errors:\n"
+                    f"{json.dumps(errors, indent=2)}"
+                )
+                if options["durable"]:
+                    tqdm.write(error_str)
+                else:
+                    raise ValueError(error_str)
+
+    def summary(self, file_import_attempt):
+        ModelImportAttemptError = apps.get_model(
+            "django_import_data.ModelImportAttemptError"
+        )
         error_summary = {}
         total_form_errors = 0
         total_conversion_errors = 0
@@ -511,44 +1015,34 @@ class BaseImportCommand(BaseCommand):
             )
         )
 
-        for row_errors in all_errors:
-            for attribute, attribute_errors in row_errors.items():
-                error_summary.setdefault(attribute, {})
-                conversion_errors = attribute_errors.get("conversion_errors", {})
-                total_conversion_errors += len(conversion_errors)
-                for conversion_error in conversion_errors:
-                    error_summary[attribute].setdefault("conversion_errors", {})
-                    error_summary[attribute]["conversion_errors"].setdefault("count", 0)
-                    error_summary[attribute]["conversion_errors"]["count"] += len(
-                        conversion_error
-                    )
-
-                    error_summary[attribute]["conversion_errors"].setdefault(
-                        "fields", []
-                    )
-                    if (
-                        conversion_error["from_fields"]
-                        not in error_summary[attribute]["conversion_errors"]["fields"]
-                    ):
-                        error_summary[attribute]["conversion_errors"]["fields"].append(
-                            conversion_error["from_fields"]
-                        )
-
-                form_errors = attribute_errors.get("form_errors", {})
-                total_form_errors += len(form_errors)
-                for form_error in form_errors:
-                    error_summary[attribute].setdefault("form_errors", {})
-                    error_summary[attribute]["form_errors"].setdefault("count", 0)
-                    error_summary[attribute]["form_errors"]["count"] += len(form_error)
-
-                    error_summary[attribute]["form_errors"].setdefault("fields", [])
-                    if (
-                        form_error["field"]
-                        not in error_summary[attribute]["form_errors"]["fields"]
-                    ):
-                        error_summary[attribute]["form_errors"]["fields"].append(
-                            form_error["field"]
-                        )
+        # Count the errors of each type, per attribute (i.e. FormMap) and field
+        error_counts = (
+            ModelImportAttemptError.objects.filter(
+                model_import_attempt__model_importer__row_data__file_import_attempt=file_import_attempt
+            )
+            .values(
+                "error_type",
+                "field",
+                "from_fields",
+                attribute=F("model_import_attempt__imported_by"),
+            )
+            .annotate(count=Count("id"))
+            .order_by("attribute", "error_type", "field", "from_fields")
+        )
+        for error_count in error_counts:
+            if error_count["error_type"] == "conversion":
+                total_conversion_errors += error_count["count"]
+                fields = error_count["from_fields"]
+            else:
+                total_form_errors += error_count["count"]
+                fields = error_count["field"]
+            attribute_errors = error_summary.setdefault(error_count["attribute"], {})
+            errors_of_type = attribute_errors.setdefault(
+                f"{error_count['error_type']}_errors", {"count": 0, "fields": []}
+            )
+            errors_of_type["count"] += error_count["count"]
+            if fields not in errors_of_type["fields"]:
+                errors_of_type["fields"].append(fields)
         if self.verbosity == 3:
             tqdm.write("=" * 80)
             tqdm.write("Model Import Summary:")
@@ -586,17 +1080,95 @@ class BaseImportCommand(BaseCommand):
         LOGGER.debug(
             f"Created FIB {file_importer_batch.id}; will process {files_to_process} {self.verbosity}"
         )
-        for path in files_to_process:
-            if self.verbosity == 3:
-                tqdm.write(f"Processing {path}")
-            file_import_attempt = self.handle_file(path, file_importer_batch, **options)
-            # LOGGER.debug(
-            #     f"handle_files: file_import_attempt: {file_import_attempt.id}; {file_import_attempt.file_importer.file_importer_batch.id}"
-            # )
-            assert file_import_attempt is not None
+        # Files are only committed in chunks by file-based importers; row-based
+        # importers commit in chunks of rows instead (see handle_file)
+        if self.PROGRESS_TYPE == self.PROGRESS_TYPES.FILE:
+            commit_every = options["commit_every"]
+        else:
+            commit_every = None
+        if commit_every:
+            chunks = chunked(files_to_process, commit_every)
+        else:
+            chunks = [files_to_process]
+        # If propagating, do so once each file is done, rather than per save
+        propagation = deferred_propagation if options["propagate"] else nullcontext
+        for chunk in chunks:
+            with transaction.atomic() if commit_every else nullcontext():
+                for path in chunk:
+                    if self.verbosity == 3:
+                        tqdm.write(f"Processing {path}")
+                    with propagation():
+                        file_import_attempt = self.handle_file(
+                            path, file_importer_batch, **options
+                        )
+                    # LOGGER.debug(
+                    #     f"handle_files: file_import_attempt: {file_import_attempt.id}; {file_import_attempt.file_importer.file_importer_batch.id}"
+                    # )
+                    assert file_import_attempt is not None
 
         return file_importer_batch
 
+    def handle_files_in_parallel(self, files_to_process, **options):
+        """Handle the given files across a pool of worker processes
+
+        Each worker has its own DB connection, and handles each file in its
+        own transaction. All files are attached to the same FIB, which is
+        committed before any workers are started (so that they can see it)"""
+        global _WORKER_STATE
+
+        FileImporterBatch = apps.get_model("django_import_data.FileImporterBatch")
+        current_command = self.__module__.split(".")[-1]
+        # NOTE: Any future positional args will need to be popped out here, too
+        paths = options.pop("paths")
+        file_importer_batch = FileImporterBatch.objects.create(
+            command=current_command, args=paths, kwargs=options
+        )
+        LOGGER.debug(
+            f"Created FIB {file_importer_batch.id}; will process {len(files_to_process)} "
+            f"files across {options['workers']} workers"
+        )
+
+        # Forked workers must not share our DB connection(s), so close them
+        # here; each worker will then open its own on first use
+        connections.close_all()
+        _WORKER_STATE = (self, file_importer_batch.id, options)
+        file_import_attempt_ids = []
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = {
+                executor.submit(_handle_file_in_worker, path): path
+                for path in files_to_process
+            }
+            progress = tqdm(
+                as_completed(futures),
+                total=len(futures),
+                desc=self.help,
+                unit="files",
+                disable=self.PROGRESS_TYPE != self.PROGRESS_TYPES.FILE,
+            )
+            for future in progress:
+                if self.verbosity == 3:
+                    tqdm.write(f"Processed {futures[future]}")
+                try:
+                    file_import_attempt_ids.append(future.result())
+                except Exception:
+                    # Don't bother starting any files that are still queued up
+                    for pending_future in futures:
+                        pending_future.cancel()
+                    raise
+
+        _WORKER_STATE = None
+        LOGGER.debug(
+            f"Workers created {len([id_ for id_ in file_import_attempt_ids if id_])} "
+            f"FIAs for FIB {file_importer_batch.id}"
+        )
+        # The workers have modified the FIB's children (and possibly the FIB
+        # itself), so make sure that we aren't working with stale values
+        file_importer_batch.refresh_from_db()
+        return file_importer_batch
+
     def post_import_actions(self, file_importer_batch):
         LOGGER.debug("Performing post_import_actions")
         FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
@@ -618,7 +1190,9 @@ class BaseImportCommand(BaseCommand):
         tqdm.write("All Batch-Level Errors")
         all_file_errors = [
             fi.latest_file_import_attempt.errors
-            for fi in file_importer_batch.file_importers.all()
+            for fi in file_importer_batch.file_importers.select_related(
+                "latest_file_import_attempt"
+            )
             if fi and fi.latest_file_import_attempt.errors
         ]
 
@@ -693,10 +1267,48 @@ class BaseImportCommand(BaseCommand):
                 else:
                     raise ValueError("Duplicate paths found! See log for details")
 
-        if self.PROGRESS_TYPE == self.PROGRESS_TYPES.FILE:
+        # In parallel mode, progress is instead tracked as files are completed
+        if self.PROGRESS_TYPE == self.PROGRESS_TYPES.FILE and options["workers"] < 2:
             files_to_process = tqdm(files_to_process, desc=self.help, unit="files")
 
-        if options["no_transaction"]:
+        if options["commit_every"] and (
+            options["dry_run"] or options["no_transaction"]
+        ):
+            raise ValueError(
+                "--commit-every cannot be used with --dry-run or --no-transaction"
+            )
+        if options["resume"] and options["dry_run"]:
+            raise ValueError("--resume cannot be used with --dry-run")
+        if options["resume"] and options["incremental"]:
+            # The FIA being resumed would be diffed against (and thus deleted)
+            raise ValueError("--resume cannot be used with --incremental")
+        selects_rows = self.PROGRESS_TYPE == self.PROGRESS_TYPES.ROW and (
+            options.get("rows")
+            or options.get("limit") is not None
+            or options.get("start_index", self.START_INDEX_DEFAULT)
+            != self.START_INDEX_DEFAULT
+            or options.get("end_index", self.END_INDEX_DEFAULT)
+            != self.END_INDEX_DEFAULT
+        )
+        if options["incremental"] and selects_rows:
+            # Unchanged rows that weren't selected would never be carried
+            # forward, and would be left behind on the (deleted) previous FIA
+            raise ValueError(
+                "--incremental cannot be used with --rows, --limit, --start-index "
+                "or --end-index"
+            )
+
+        if options["workers"] > 1:
+            if options["dry_run"]:
+                raise ValueError(
+                    "--dry-run cannot be used with --workers, since each file "
+                    "is imported (and committed) in its own transaction"
+                )
+            file_importer_batch = self.handle_files_in_parallel(
+                files_to_process, **options
+            )
+        elif options["no_transaction"] or options["commit_every"]:
+            # If commit_every is given, transactions are handled in chunks
             file_importer_batch = self.handle_files(files_to_process, **options)
         else:
             with transaction.atomic():
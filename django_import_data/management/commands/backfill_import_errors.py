@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tqdm import tqdm
+
+from django_import_data.models import ModelImportAttempt, ModelImportAttemptError
+from django_import_data.utils import chunked
+
+
+class Command(BaseCommand):
+    help = (
+        "Create Model Import Attempt Errors for all Model Import Attempts that have "
+        "errors but no error records. Error records are normally created alongside "
+        "their attempts, so this is only needed for data that predates them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    @transaction.atomic
+    def handle(self, *args, **kwargs):
+        model_import_attempts = (
+            ModelImportAttempt.objects.exclude(errors={})
+            .filter(error_records__isnull=True)
+            .only("id", "errors")
+        )
+        num_error_records = 0
+        for batch in chunked(
+            tqdm(model_import_attempts.iterator(), unit="attempts"),
+            kwargs["batch_size"],
+        ):
+            error_records = [
+                error_record
+                for model_import_attempt in batch
+                for error_record in ModelImportAttemptError.from_model_import_attempt(
+                    model_import_attempt
+                )
+            ]
+            ModelImportAttemptError.objects.bulk_create(error_records)
+            num_error_records += len(error_records)
+        print(f"Created {num_error_records} Model Import Attempt Errors")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_import_data.models import FileImporter, ModelImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Point every File Importer and Model Importer at its most recent attempt. "
+        "These are normally maintained as attempts are created, so this is only "
+        "needed for data that predates them (or was modified by other means)"
+    )
+
+    @transaction.atomic
+    def handle(self, *args, **kwargs):
+        num_file_importers = (
+            FileImporter.objects.all().set_latest_file_import_attempts()
+        )
+        print(f"Updated {num_file_importers} File Importers")
+        num_model_importers = (
+            ModelImporter.objects.all().set_latest_model_import_attempts()
+        )
+        print(f"Updated {num_model_importers} Model Importers")
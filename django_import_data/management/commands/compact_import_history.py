@@ -0,0 +1,201 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from tqdm import tqdm
+
+from django_import_data.deletion import fast_delete
+from django_import_data.models import (
+    FileImportAttempt,
+    FileImportAttemptArchive,
+    ModelImportAttempt,
+    ModelImporter,
+    RowData,
+)
+from django_import_data.utils import chunked
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact superseded File Import Attempts: replace each one's Row Data, "
+        "Model Importers and Model Import Attempts with a File Import Attempt "
+        "Archive, which holds its summary, creations, condensed errors and "
+        "(optionally) a compressed copy of its raw rows. The attempts themselves "
+        "are kept, so provenance is not lost"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-last",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Keep the latest N attempts of each File Importer in full",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            metavar="DAYS",
+            help="Only compact attempts created more than DAYS days ago",
+        )
+        parser.add_argument(
+            "--archive-rows",
+            choices=dict(FileImportAttemptArchive.COMPRESSIONS),
+            help="If given, archive the raw rows of each attempt, compressed thusly",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of Row Data to remove per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be compacted, without compacting it",
+        )
+
+    def get_superseded_file_import_attempts(self, keep_last, older_than=None):
+        """Return the IDs of all FIAs that are not among their FI's latest keep_last"""
+
+        file_import_attempts = FileImportAttempt.objects.all()
+        if older_than is not None:
+            file_import_attempts = file_import_attempts.filter(
+                created_on__lt=timezone.now() - timedelta(days=older_than)
+            )
+        # Archived FIAs might have rows left, if a previous run was interrupted
+        file_import_attempts = file_import_attempts.filter(
+            Q(archive__isnull=True)
+            | Q(id__in=RowData.objects.values("file_import_attempt"))
+        )
+        candidate_ids = set(file_import_attempts.values_list("id", flat=True))
+
+        # Every FIA, newest first, grouped by FI
+        all_file_import_attempts = FileImportAttempt.objects.order_by(
+            "file_importer", "-created_on"
+        ).values_list("file_importer", "id")
+        superseded = []
+        num_seen = defaultdict(int)
+        for file_importer_id, file_import_attempt_id in all_file_import_attempts:
+            num_seen[file_importer_id] += 1
+            if (
+                num_seen[file_importer_id] > keep_last
+                and file_import_attempt_id in candidate_ids
+            ):
+                superseded.append(file_import_attempt_id)
+        return superseded
+
+    def has_importees(self, file_import_attempt):
+        """Return True if any models imported by file_import_attempt still exist
+
+        Removing the attempt's MIAs would (via cascade) delete these, too"""
+
+        for content_type in ContentType.objects.filter(
+            id__in=file_import_attempt.row_datas.values(
+                "model_importers__model_import_attempts__content_type"
+            )
+        ):
+            if (
+                content_type.model_class()
+                .objects.filter(
+                    model_import_attempt__model_importer__row_data__file_import_attempt=file_import_attempt
+                )
+                .exists()
+            ):
+                return True
+        return False
+
+    @transaction.atomic
+    def archive(self, file_import_attempt, archive_rows=None):
+        """Create (and return) a FileImportAttemptArchive of file_import_attempt"""
+
+        row_datas = file_import_attempt.row_datas.all()
+        row_statuses = {
+            RowData.STATUSES[status].value: count
+            for status, count in row_datas.values_list("status")
+            .annotate(count=Count("id"))
+            .order_by("status")
+        }
+        summary = {
+            "row_statuses": row_statuses,
+            "num_model_importers": ModelImporter.objects.filter(
+                row_data__file_import_attempt=file_import_attempt
+            ).count(),
+            "num_model_import_attempts": ModelImportAttempt.objects.filter(
+                model_importer__row_data__file_import_attempt=file_import_attempt
+            ).count(),
+        }
+        condensed_errors = file_import_attempt.condensed_errors_by_row_as_dicts()
+        if file_import_attempt.condensed_errors is None:
+            # Once the rows are gone, the condensed errors can't be re-derived
+            FileImportAttempt.objects.filter(id=file_import_attempt.id).update(
+                condensed_errors=condensed_errors
+            )
+
+        if archive_rows:
+            rows = []
+            for row_data in row_datas.order_by("row_num").iterator():
+                # Compact rows need their FIA's headers to reconstruct their data
+                row_data.file_import_attempt = file_import_attempt
+                rows.append({"row_num": row_data.row_num, "data": row_data.data})
+            rows = FileImportAttemptArchive.compress_rows(rows, archive_rows)
+        else:
+            rows = None
+
+        return FileImportAttemptArchive.objects.create(
+            file_import_attempt=file_import_attempt,
+            num_rows=sum(row_statuses.values()),
+            summary=summary,
+            creations=file_import_attempt.creations,
+            condensed_errors=condensed_errors,
+            rows=rows,
+            compression=archive_rows or "",
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["keep_last"] < 1:
+            raise CommandError("--keep-last must be at least 1")
+
+        file_import_attempt_ids = self.get_superseded_file_import_attempts(
+            kwargs["keep_last"], older_than=kwargs["older_than"]
+        )
+        print(f"Compacting {len(file_import_attempt_ids)} File Import Attempts")
+        if kwargs["dry_run"]:
+            return
+
+        num_compacted = 0
+        num_deletions = 0
+        skipped = []
+        for file_import_attempt in tqdm(
+            FileImportAttempt.objects.filter(id__in=file_import_attempt_ids),
+            total=len(file_import_attempt_ids),
+            unit="attempts",
+        ):
+            if self.has_importees(file_import_attempt):
+                skipped.append(file_import_attempt.id)
+                continue
+
+            if not hasattr(file_import_attempt, "archive"):
+                self.archive(file_import_attempt, archive_rows=kwargs["archive_rows"])
+            # Each batch of rows is removed in its own transaction
+            row_data_ids = list(
+                file_import_attempt.row_datas.values_list("id", flat=True)
+            )
+            for batch in chunked(row_data_ids, kwargs["batch_size"]):
+                num_deletions += fast_delete(RowData.objects.filter(id__in=batch))[0]
+            num_compacted += 1
+
+        if skipped:
+            print(
+                f"Skipped {len(skipped)} File Import Attempts whose imported models "
+                f"still exist: {skipped}"
+            )
+        print(
+            f"Compacted {num_compacted} File Import Attempts; deleted "
+            f"{num_deletions} objects"
+        )
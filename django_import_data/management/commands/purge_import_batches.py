@@ -0,0 +1,121 @@
+from collections import Counter
+from datetime import timedelta
+from pprint import pformat
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tqdm import tqdm
+
+from django_import_data.deletion import fast_delete
+from django_import_data.models import (
+    FileImportAttempt,
+    FileImporter,
+    FileImporterBatch,
+)
+from django_import_data.utils import chunked
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge the File Import Attempts created by the given File Importer Batches, "
+        "along with all of their Row Data, Model Importers and Model Import "
+        "Attempts (and anything that cascades from those), via set-based DELETEs. "
+        "By default, attempts that are still the latest of their File Importer "
+        "are kept. Batches left with nothing in them are then deleted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "file_importer_batches",
+            nargs="*",
+            type=int,
+            help="IDs of the File Importer Batches to purge",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            metavar="DAYS",
+            help="Purge all File Importer Batches created more than DAYS days ago",
+        )
+        parser.add_argument(
+            "--include-latest",
+            action="store_true",
+            help=(
+                "Also purge attempts that are still the latest of their File "
+                "Importer. Note that this deletes the models they imported"
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of File Import Attempts to purge per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be purged, without purging it",
+        )
+
+    def handle(self, *args, **kwargs):
+        if not (kwargs["file_importer_batches"] or kwargs["older_than"]):
+            raise CommandError(
+                "File Importer Batch IDs and/or --older-than must be given"
+            )
+
+        file_importer_batches = FileImporterBatch.objects.all()
+        if kwargs["file_importer_batches"]:
+            file_importer_batches = file_importer_batches.filter(
+                id__in=kwargs["file_importer_batches"]
+            )
+        if kwargs["older_than"] is not None:
+            file_importer_batches = file_importer_batches.filter(
+                created_on__lt=timezone.now() - timedelta(days=kwargs["older_than"])
+            )
+
+        file_import_attempts = FileImportAttempt.objects.filter(
+            file_importer_batch__in=file_importer_batches
+        )
+        if not kwargs["include_latest"]:
+            file_import_attempts = file_import_attempts.exclude(
+                id__in=FileImporter.objects.filter(
+                    latest_file_import_attempt__isnull=False
+                ).values("latest_file_import_attempt")
+            )
+        file_import_attempt_ids = list(
+            file_import_attempts.values_list("id", flat=True)
+        )
+        print(
+            f"Purging {len(file_import_attempt_ids)} File Import Attempts from "
+            f"{file_importer_batches.count()} File Importer Batches"
+        )
+        if kwargs["dry_run"]:
+            return
+
+        file_importer_ids = set()
+        num_deletions = 0
+        deletions = Counter()
+        for chunk in chunked(
+            tqdm(file_import_attempt_ids, unit="attempts"), kwargs["batch_size"]
+        ):
+            to_delete = FileImportAttempt.objects.filter(id__in=chunk)
+            file_importer_ids.update(to_delete.values_list("file_importer", flat=True))
+            # Each chunk is deleted in its own transaction
+            num_deletions_for_chunk, deletions_for_chunk = fast_delete(to_delete)
+            num_deletions += num_deletions_for_chunk
+            deletions += deletions_for_chunk
+
+        if kwargs["include_latest"] and file_importer_ids:
+            # Some FIs may have lost their latest FIAs, and thus their statuses
+            file_importers = FileImporter.objects.filter(id__in=file_importer_ids)
+            file_importers.set_latest_file_import_attempts()
+            file_importers.derive_values()
+
+        num_batch_deletions, __ = file_importer_batches.filter(
+            file_importers__isnull=True, file_import_attempts__isnull=True
+        ).delete()
+        print(
+            f"Deleted {num_deletions} objects and {num_batch_deletions} empty "
+            f"File Importer Batches:\n{pformat(dict(deletions))}"
+        )
@@ -1,9 +1,12 @@
+import io
 import json
 import os
 
+from psycopg2.extras import Json
+
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import connections, models
 
 from .querysets import (
     FileImportAttemptQuerySet,
@@ -15,7 +18,76 @@ from .querysets import (
 )
 
 
+def to_copy_text(value):
+    """Convert a DB-ready value to its representation in COPY's text format"""
+
+    if value is None:
+        return "\\N"
+    if isinstance(value, Json):
+        value = value.dumps(value.adapted)
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (list, tuple, dict)):
+        raise TypeError(f"Can't COPY value {value!r}; it must be adapted first")
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
 class DerivedValuesManager(models.Manager):
+    def copy_create(self, instances):
+        """Create the given instances via Postgres' COPY ... FROM STDIN
+
+        This is equivalent to bulk_create (i.e. save() is not called, and no
+        signals are sent), but is significantly faster for large numbers of
+        instances. IDs are allocated from the table's sequence up front, so
+        (as with bulk_create) the given instances have their PKs set"""
+
+        if not instances:
+            return instances
+
+        connection = connections[self.db]
+        opts = self.model._meta
+        fields = opts.concrete_fields
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                "FROM generate_series(1, %s)",
+                [opts.db_table, opts.pk.column, len(instances)],
+            )
+            for instance, (id_,) in zip(instances, cursor.fetchall()):
+                instance.pk = id_
+
+            buffer = io.StringIO()
+            for instance in instances:
+                buffer.write(
+                    "\t".join(
+                        to_copy_text(
+                            field.get_db_prep_save(
+                                field.pre_save(instance, True), connection
+                            )
+                        )
+                        for field in fields
+                    )
+                )
+                buffer.write("\n")
+            buffer.seek(0)
+            columns = ", ".join(quote_name(field.column) for field in fields)
+            cursor.copy_expert(
+                f"COPY {quote_name(opts.db_table)} ({columns}) FROM STDIN", buffer
+            )
+
+        for instance in instances:
+            instance._state.adding = False
+            instance._state.db = self.db
+        return instances
+
     def create_fast(self, *args, **kwargs):
         return self.create(
             *args, **kwargs, derive_cached_values=False, propagate_derived_values=False
@@ -83,6 +155,7 @@ class ModelImporterManager(DerivedValuesManager):
             propagate_derived_values=propagate_derived_values,
             **kwargs,
         )
+        row_data.audit_results.append(model_import_attempt)
         return model_importer, model_import_attempt
 
     def get_queryset(self):
@@ -98,6 +171,9 @@ class ModelImportAttemptManager(DerivedValuesManager):
         propagate_derived_values=False,
         **kwargs,
     ):
+        ModelImportAttemptError = apps.get_model(
+            "django_import_data.ModelImportAttemptError"
+        )
         content_type = ContentType.objects.get_for_model(model)
         model_import_attempt = self.create(
             derive_cached_values=derive_cached_values,
@@ -106,6 +182,10 @@ class ModelImportAttemptManager(DerivedValuesManager):
             imported_by=imported_by,
             **kwargs,
         )
+        if model_import_attempt.errors:
+            ModelImportAttemptError.objects.bulk_create(
+                ModelImportAttemptError.from_model_import_attempt(model_import_attempt)
+            )
         return model_import_attempt
 
     def get_queryset(self):
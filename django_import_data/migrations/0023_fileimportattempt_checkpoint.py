@@ -0,0 +1,18 @@
+# Generated by Django 3.0.14 on 2026-10-17 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0022_auto_20190716_1542'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileimportattempt',
+            name='checkpoint',
+            field=models.PositiveIntegerField(blank=True, help_text='If set, this import is incomplete: this is the number of the last row that was committed', null=True),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:21
+
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations
+import django_import_data.mixins
+
+
+def hash_data(data):
+    # This must match RowData.hash_data
+    return hashlib.sha1(
+        json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode("utf-8")
+    ).hexdigest()
+
+
+def set_content_hashes(apps, schema_editor):
+    RowData = apps.get_model("django_import_data", "RowData")
+
+    # Otherwise, the first --incremental import of each existing FIA would
+    # find that none of its rows match, and re-import all of them
+    row_datas = []
+    for row_data in RowData.objects.only("id", "data").iterator():
+        row_data.content_hash = hash_data(row_data.data)
+        row_datas.append(row_data)
+        if len(row_datas) >= 1000:
+            RowData.objects.bulk_update(row_datas, ["content_hash"])
+            row_datas = []
+    RowData.objects.bulk_update(row_datas, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0023_fileimportattempt_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rowdata',
+            name='content_hash',
+            field=django_import_data.mixins.SensibleCharField(blank=True, default='', help_text='SHA-1 hash of data; used to detect changed rows between imports', max_length=40),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_content_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:06
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def set_latest_attempts(apps, schema_editor):
+    FileImporter = apps.get_model("django_import_data", "FileImporter")
+    FileImportAttempt = apps.get_model("django_import_data", "FileImportAttempt")
+    ModelImporter = apps.get_model("django_import_data", "ModelImporter")
+    ModelImportAttempt = apps.get_model("django_import_data", "ModelImportAttempt")
+
+    FileImporter.objects.update(
+        latest_file_import_attempt=Subquery(
+            FileImportAttempt.objects.filter(file_importer=OuterRef("pk"))
+            .order_by("-created_on")
+            .values("id")[:1]
+        )
+    )
+    ModelImporter.objects.update(
+        latest_model_import_attempt=Subquery(
+            ModelImportAttempt.objects.filter(model_importer=OuterRef("pk"))
+            .order_by("-created_on")
+            .values("id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0024_rowdata_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileimporter',
+            name='latest_file_import_attempt',
+            field=models.ForeignKey(blank=True, help_text="The most recent of this FI's FIAs. This is maintained as FIAs are created", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='django_import_data.FileImportAttempt'),
+        ),
+        migrations.AddField(
+            model_name='modelimporter',
+            name='latest_model_import_attempt',
+            field=models.ForeignKey(blank=True, help_text="The most recent of this MI's MIAs. This is maintained as MIAs are created", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='django_import_data.ModelImportAttempt'),
+        ),
+        migrations.RunPython(set_latest_attempts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:09
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+import django_import_data.mixins
+import django_import_data.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0025_latest_attempts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelImportAttemptError',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('error_type', django_import_data.mixins.SensibleCharField(choices=[('form', 'Form'), ('conversion', 'Conversion')], default=None, max_length=16)),
+                ('field', django_import_data.mixins.SensibleTextField(blank=True, help_text='The form field that had the error')),
+                ('alias', django_import_data.mixins.SensibleTextField(blank=True, help_text='The (first) header in the original data that the error relates to')),
+                ('aliases', django.contrib.postgres.fields.ArrayField(base_field=django_import_data.mixins.SensibleTextField(default=None), default=list, help_text='All headers in the original data that the error relates to', size=None)),
+                ('from_fields', django.contrib.postgres.fields.ArrayField(base_field=django_import_data.mixins.SensibleTextField(default=None), default=list, size=None)),
+                ('to_fields', django.contrib.postgres.fields.ArrayField(base_field=django_import_data.mixins.SensibleTextField(default=None), default=list, size=None)),
+                ('converter', django_import_data.mixins.SensibleTextField(blank=True)),
+                ('value', django.contrib.postgres.fields.jsonb.JSONField(blank=True, encoder=django_import_data.utils.DjangoErrorJSONEncoder, null=True)),
+                ('message', models.TextField(help_text="The error itself. For form errors, this is each of the field's errors, one per line")),
+                ('model_import_attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='error_records', to='django_import_data.ModelImportAttempt')),
+            ],
+            options={
+                'verbose_name': 'Model Import Attempt Error',
+                'verbose_name_plural': 'Model Import Attempt Errors',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='modelimportattempterror',
+            index=models.Index(fields=['error_type', 'field'], name='django_impo_error_t_c6fb68_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelimportattempterror',
+            index=models.Index(fields=['alias'], name='django_impo_alias_02c27d_idx'),
+        ),
+    ]
+
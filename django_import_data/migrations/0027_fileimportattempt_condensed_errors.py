@@ -0,0 +1,21 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:10
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+import django_import_data.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0026_modelimportattempterror'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileimportattempt',
+            name='condensed_errors',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, encoder=django_import_data.utils.DjangoErrorJSONEncoder, help_text='Cached result of derive_condensed_errors; set once the import is complete', null=True),
+        ),
+    ]
+
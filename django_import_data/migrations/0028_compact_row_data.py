@@ -0,0 +1,46 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:13
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0027_fileimportattempt_condensed_errors'),
+    ]
+
+    operations = [
+        # RowData.data is now a property, backed by the existing "data" column
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RenameField(
+                    model_name='rowdata',
+                    old_name='data',
+                    new_name='raw_data',
+                ),
+                migrations.AlterField(
+                    model_name='rowdata',
+                    name='raw_data',
+                    field=django.contrib.postgres.fields.jsonb.JSONField(db_column='data', encoder=django.core.serializers.json.DjangoJSONEncoder, help_text="Stores a 'row' (or similar construct) of data as it was originally encountered"),
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='rowdata',
+            name='raw_data',
+            field=django.contrib.postgres.fields.jsonb.JSONField(db_column='data', encoder=django.core.serializers.json.DjangoJSONEncoder, help_text="Stores a 'row' (or similar construct) of data as it was originally encountered", null=True),
+        ),
+        migrations.AddField(
+            model_name='rowdata',
+            name='values',
+            field=django.contrib.postgres.fields.jsonb.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text="Stores only the values of a 'compact' row, in the order of its File Import Attempt's headers (instead of raw_data)", null=True),
+        ),
+        migrations.AddField(
+            model_name='fileimportattempt',
+            name='headers',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, help_text='If set, the headers of the file (in order), against which compact Row Data store their values', null=True, size=None),
+        ),
+    ]
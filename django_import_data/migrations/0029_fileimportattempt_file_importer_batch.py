@@ -0,0 +1,39 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:17
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def set_file_importer_batches(apps, schema_editor):
+    FileImporter = apps.get_model("django_import_data", "FileImporter")
+    FileImportAttempt = apps.get_model("django_import_data", "FileImportAttempt")
+
+    # The best guess available: each FI's latest FIA was created by the FI's
+    # (latest) batch. Older FIAs' batches were overwritten on their FIs by
+    # later batches, so they are left unknown
+    FileImportAttempt.objects.filter(
+        id__in=FileImporter.objects.values("latest_file_import_attempt")
+    ).update(
+        file_importer_batch=Subquery(
+            FileImporter.objects.filter(
+                latest_file_import_attempt=OuterRef("pk")
+            ).values("file_importer_batch")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0028_compact_row_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileimportattempt',
+            name='file_importer_batch',
+            field=models.ForeignKey(blank=True, help_text='The File Importer Batch that this was created by', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='file_import_attempts', to='django_import_data.FileImporterBatch'),
+        ),
+        migrations.RunPython(set_file_importer_batches, migrations.RunPython.noop),
+    ]
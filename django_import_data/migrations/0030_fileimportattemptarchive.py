@@ -0,0 +1,37 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:18
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+import django_import_data.mixins
+import django_import_data.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0029_fileimportattempt_file_importer_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileImportAttemptArchive',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('modified_on', models.DateTimeField(auto_now=True, null=True)),
+                ('num_rows', models.PositiveIntegerField()),
+                ('summary', django.contrib.postgres.fields.jsonb.JSONField(default=dict, encoder=django_import_data.utils.DjangoErrorJSONEncoder, help_text="Counts of the attempt's rows (by status) and audit models")),
+                ('creations', django.contrib.postgres.fields.jsonb.JSONField(default=dict, encoder=django_import_data.utils.DjangoErrorJSONEncoder, null=True)),
+                ('condensed_errors', django.contrib.postgres.fields.jsonb.JSONField(encoder=django_import_data.utils.DjangoErrorJSONEncoder, null=True)),
+                ('rows', models.BinaryField(help_text="If set, the attempt's rows (as JSON), compressed via compression", null=True)),
+                ('compression', django_import_data.mixins.SensibleCharField(blank=True, choices=[('gzip', 'gzip'), ('zstd', 'Zstandard')], max_length=8)),
+                ('file_import_attempt', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='archive', to='django_import_data.FileImportAttempt')),
+            ],
+            options={
+                'verbose_name': 'File Import Attempt Archive',
+                'verbose_name_plural': 'File Import Attempt Archives',
+            },
+        ),
+    ]
+
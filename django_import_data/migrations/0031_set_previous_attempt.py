@@ -0,0 +1,24 @@
+# Generated by Django 3.0.14 on 2026-10-17 03:30
+
+from django.db import migrations, models
+import django_import_data.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_import_data', '0030_fileimportattemptarchive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='fileimporter',
+            name='latest_file_import_attempt',
+            field=models.ForeignKey(blank=True, help_text="The most recent of this FI's FIAs. This is maintained as FIAs are created", null=True, on_delete=django_import_data.models.SET_PREVIOUS_ATTEMPT, related_name='+', to='django_import_data.FileImportAttempt'),
+        ),
+        migrations.AlterField(
+            model_name='modelimporter',
+            name='latest_model_import_attempt',
+            field=models.ForeignKey(blank=True, help_text="The most recent of this MI's MIAs. This is maintained as MIAs are created", null=True, on_delete=django_import_data.models.SET_PREVIOUS_ATTEMPT, related_name='+', to='django_import_data.ModelImportAttempt'),
+        ),
+    ]
@@ -4,7 +4,8 @@ from datetime import datetime
 from django.db import models
 from django.utils.timezone import make_aware, now
 
-from .utils import OrderedEnum, hash_file
+from .hashcache import get_hash_cache
+from .utils import OrderedEnum
 
 
 class SensibleTextyField:
@@ -138,8 +139,9 @@ class TrackedFileMixin(models.Model):
         try:
             # If the file can be found, we determine its modification time
             # This is done regardless of whether the files contents have changed
+            stat_result = os.stat(self.file_path)
             fs_file_modified_on = make_aware(
-                datetime.fromtimestamp(os.path.getmtime(self.file_path))
+                datetime.fromtimestamp(stat_result.st_mtime)
             )
         except (FileNotFoundError, OSError):
             # If the file can't be found (or the name is invalid, and an OSError
@@ -151,8 +153,11 @@ class TrackedFileMixin(models.Model):
             if self.file_modified_on != fs_file_modified_on or always_hash:
                 self.file_modified_on = fs_file_modified_on
                 self.hash_checked_on = now()
-                # Attempt to determine the hash of the file on disk
-                actual_hash_on_disk = hash_file(self.file_path)
+                # Attempt to determine the hash of the file on disk. This will
+                # only actually read the file if it isn't in the hash cache
+                actual_hash_on_disk = get_hash_cache().hash_file(
+                    self.file_path, stat_result
+                )
                 # Now determine whether the contents of the file have changed since
                 # last check
                 if self.hash_on_disk != actual_hash_on_disk:
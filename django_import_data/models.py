@@ -3,26 +3,38 @@
 from collections import Counter, defaultdict
 from importlib import import_module
 from pprint import pformat
+import gzip
+import hashlib
 import json
 import os
 
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.postgres.fields import ArrayField, JSONField
 from django.core.exceptions import FieldError
 from django.core.management import call_command
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db import transaction
+from django.db.models import Min, OuterRef, Subquery
 from django.urls import reverse
 from django.utils.functional import cached_property
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 from .mixins import (
     ImportStatusModel,
     CurrentStatusModel,
     TrackedModel,
     TrackedFileMixin,
     SensibleCharField,
+    SensibleTextField,
 )
+from .deletion import fast_delete
+from .propagation import defer_propagation
 from .utils import DjangoErrorJSONEncoder
 from .utils import get_str_from_nums
 from .managers import (
@@ -34,6 +46,65 @@ from .managers import (
     RowDataManager,
 )
 
+
+def set_as_latest_attempt(attempt, parent_field_name, latest_field_name):
+    """Point the parent of the given (newly-created) attempt at it
+
+    This is done via a single UPDATE, so that the parent doesn't need to be
+    fetched. If the parent has already been fetched, however, it is also
+    updated in memory (so that it isn't reverted by its next save)"""
+    parent_field = attempt._meta.get_field(parent_field_name)
+    parent_field.related_model._default_manager.filter(
+        id=getattr(attempt, parent_field.attname)
+    ).update(**{latest_field_name: attempt})
+    if parent_field.is_cached(attempt):
+        setattr(getattr(attempt, parent_field_name), latest_field_name, attempt)
+
+
+def get_previous_attempts(field, parent, deleted):
+    """Return a queryset of the attempts of parent that aren't in deleted
+
+    field is the parent's latest-attempt field; parent may be an OuterRef"""
+    attempt_model = field.related_model
+    (parent_field,) = [
+        attempt_field
+        for attempt_field in attempt_model._meta.concrete_fields
+        if attempt_field.is_relation and attempt_field.related_model is field.model
+    ]
+    return (
+        attempt_model._base_manager.filter(**{parent_field.name: parent})
+        .exclude(pk__in=deleted)
+        .order_by("-created_on")
+    )
+
+
+def SET_PREVIOUS_ATTEMPT(collector, field, sub_objs, using):
+    """on_delete for latest-attempt fields: fall back to the previous attempt
+
+    That is, the most recent of the parent's attempts that isn't also being
+    deleted (or None, if there are none)"""
+    deleted = [attempt.pk for attempt in collector.data.get(field.related_model, ())]
+    for parent in sub_objs:
+        previous_attempt_id = (
+            get_previous_attempts(field, parent, deleted)
+            .using(using)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        collector.add_field_update(field, previous_attempt_id, [parent])
+
+
+def _set_previous_attempts(related_queryset, field, queryset):
+    """The set-based equivalent of SET_PREVIOUS_ATTEMPT, for fast_delete"""
+    previous_attempts = get_previous_attempts(field, OuterRef("pk"), queryset)
+    related_queryset.update(
+        **{field.name: Subquery(previous_attempts.values("pk")[:1])}
+    )
+
+
+SET_PREVIOUS_ATTEMPT.fast_delete = _set_previous_attempts
+
+
 ### ABSTRACT BASE CLASSES ###
 class RowData(ImportStatusModel, models.Model):
     file_import_attempt = models.ForeignKey(
@@ -41,14 +112,28 @@ class RowData(ImportStatusModel, models.Model):
         on_delete=models.CASCADE,
         related_name="row_datas",
     )
-    data = JSONField(
+    # Accessed via the data property, since it is not set for compact rows
+    raw_data = JSONField(
+        db_column="data",
+        null=True,
         help_text="Stores a 'row' (or similar construct) of data as it "
         "was originally encountered",
         encoder=DjangoJSONEncoder,
     )
+    values = JSONField(
+        null=True,
+        help_text="Stores only the values of a 'compact' row, in the order of "
+        "its File Import Attempt's headers (instead of raw_data)",
+        encoder=DjangoJSONEncoder,
+    )
     row_num = models.PositiveIntegerField()
     headers = JSONField(null=True)
     errors = JSONField(null=True, default=dict)
+    content_hash = SensibleCharField(
+        max_length=40,
+        blank=True,
+        help_text="SHA-1 hash of data; used to detect changed rows between imports",
+    )
 
     objects = RowDataManager()
 
@@ -65,6 +150,47 @@ class RowData(ImportStatusModel, models.Model):
     def get_absolute_url(self):
         return reverse("rowdata_detail", args=[str(self.id)])
 
+    @property
+    def data(self):
+        """The row's data, as it was originally encountered
+
+        For compact rows, this is reconstructed (once) from the FIA's headers"""
+        if self.raw_data is None and self.values is not None:
+            if getattr(self, "_data", None) is None:
+                self._data = dict(zip(self.file_import_attempt.headers, self.values))
+            return self._data
+        return self.raw_data
+
+    @data.setter
+    def data(self, data):
+        self.raw_data = data
+        self.values = None
+        self._data = None
+
+    def set_data(self, data, headers=None):
+        """Set data, storing it compactly if its keys are exactly the given headers"""
+        if headers is not None and list(data) == headers:
+            self.raw_data = None
+            self.values = list(data.values())
+            self._data = data
+        else:
+            self.data = data
+
+    @staticmethod
+    def hash_data(data):
+        """Return a SHA-1 hash of the given row data that is stable across runs"""
+        return hashlib.sha1(
+            json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode("utf-8")
+        ).hexdigest()
+
+    @cached_property
+    def audit_results(self):
+        """The MIAs made for this row (so far) by this instance
+
+        These are recorded in memory as they are created, so that the outcome of
+        handling a row can be checked without querying for it"""
+        return []
+
     def derive_status(self):
         """RD status is the most severe status of its MIs"""
         if self.model_importers.exists():
@@ -84,6 +210,9 @@ class RowData(ImportStatusModel, models.Model):
     def save(
         self, *args, derive_cached_values=True, propagate_derived_values=True, **kwargs
     ):
+        if propagate_derived_values and defer_propagation(self):
+            # Values will instead be derived (and propagated) in bulk later
+            derive_cached_values = propagate_derived_values = False
         if derive_cached_values:
             self.derive_cached_values()
         super().save(*args, **kwargs)
@@ -95,26 +224,20 @@ class RowData(ImportStatusModel, models.Model):
 
     def errors_by_alias(self):
         _errors_by_alias = defaultdict(list)
-        all_errors = ModelImportAttempt.objects.filter(
-            model_importer__row_data=self
-        ).values_list("errors", flat=True)
-        for error in all_errors:
-            if "form_errors" in error:
-                for form_error in error["form_errors"]:
-                    _errors_by_alias[form_error.pop("alias")[0]].append(
-                        {**form_error, "error_type": "form"}
-                    )
-            if "conversion_errors" in error:
-                for conversion_error in error["conversion_errors"]:
-                    for alias in [
-                        alias
-                        for aliases in conversion_error["aliases"].values()
-                        for alias in aliases
-                    ]:
-                        conversion_error.pop("aliases")
-                        _errors_by_alias[alias].append(
-                            {**conversion_error, "error_type": "conversion"}
-                        )
+        error_records = ModelImportAttemptError.objects.filter(
+            model_import_attempt__model_importer__row_data=self
+        ).order_by("-model_import_attempt__created_on", "id")
+        for error_record in error_records:
+            # Form errors are attributed only to their first alias, but
+            # conversion errors to every alias that was converted
+            if error_record.error_type == "form":
+                aliases = [error_record.alias]
+            else:
+                aliases = error_record.aliases
+            for alias in aliases:
+                _errors_by_alias[alias].append(
+                    {**error_record.as_dict(), "error_type": error_record.error_type}
+                )
 
         return _errors_by_alias
 
@@ -171,8 +294,10 @@ class AbstractBaseFileImporterBatch(ImportStatusModel, TrackedModel):
         return self.cli
 
     @transaction.atomic
-    def delete_imported_models(self, propagate=True):
-        """Delete all models imported by this FIB"""
+    def delete_imported_models(self, propagate=True, fast=False):
+        """Delete all models imported by this FIB
+
+        If fast is True, they are deleted via fast_delete"""
 
         total_num_fi_deletions = 0
         total_num_fia_deletions = 0
@@ -181,9 +306,11 @@ class AbstractBaseFileImporterBatch(ImportStatusModel, TrackedModel):
         # For every ContentType imported by this FIB...
         for fi in self.file_importers.all():
             # ...and delete them:
-            num_fia_deletions, num_mia_deletions, all_mia_deletions = fi.delete_imported_models(
-                propagate=False
-            )
+            (
+                num_fia_deletions,
+                num_mia_deletions,
+                all_mia_deletions,
+            ) = fi.delete_imported_models(propagate=False, fast=fast)
             total_num_fi_deletions += 1
             total_num_fia_deletions += num_fia_deletions
             total_num_mia_deletions += num_mia_deletions
@@ -222,6 +349,9 @@ class AbstractBaseFileImporterBatch(ImportStatusModel, TrackedModel):
     def save(
         self, *args, derive_cached_values=True, propagate_derived_values=True, **kwargs
     ):
+        if propagate_derived_values and defer_propagation(self):
+            # Values will instead be derived (and propagated) in bulk later
+            derive_cached_values = propagate_derived_values = False
         if derive_cached_values:
             self.derive_cached_values()
 
@@ -232,6 +362,7 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
     """Representation of all attempts to import a specific file"""
 
     file_importer_batch = NotImplemented
+    latest_file_import_attempt = NotImplemented
 
     importer_name = SensibleCharField(
         max_length=128, default=None, help_text="The name of the Importer to use"
@@ -243,10 +374,6 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
     def __str__(self):
         return f"File Importer for {self.name}"
 
-    @property
-    def latest_file_import_attempt(self):
-        return self.file_import_attempts.order_by("created_on").last()
-
     @property
     def name(self):
         return os.path.basename(self.file_path)
@@ -266,12 +393,8 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
 
     def derive_status(self):
         """FI status is the status of its most recent FIA"""
-        if self.file_import_attempts.exists():
-            status = (
-                self.file_import_attempts.order_by("-created_on")
-                .values_list("status", flat=True)
-                .first()
-            )
+        if self.latest_file_import_attempt_id:
+            status = self.latest_file_import_attempt.status
         else:
             status = self.STATUSES.empty.db_value
         return status
@@ -282,6 +405,9 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
     def save(
         self, *args, derive_cached_values=True, propagate_derived_values=True, **kwargs
     ):
+        if propagate_derived_values and defer_propagation(self):
+            # Values will instead be derived (and propagated) in bulk later
+            derive_cached_values = propagate_derived_values = False
         if derive_cached_values:
             self.derive_cached_values()
 
@@ -293,8 +419,10 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
             )
 
     @transaction.atomic
-    def delete_imported_models(self, propagate=True):
-        """Delete all models imported by this FI"""
+    def delete_imported_models(self, propagate=True, fast=False):
+        """Delete all models imported by this FI
+
+        If fast is True, they are deleted via fast_delete"""
 
         total_num_fia_deletions = 0
         total_num_mia_deletions = 0
@@ -302,7 +430,7 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
         for fia in self.file_import_attempts.all():
             # ...and delete them:
             num_fia_deletions, fia_deletions = fia.delete_imported_models(
-                propagate=False
+                propagate=False, fast=fast
             )
             total_num_fia_deletions += 1
             total_num_mia_deletions += num_fia_deletions
@@ -310,10 +438,15 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
 
         return (total_num_fia_deletions, total_num_mia_deletions, all_mia_deletions)
 
+    # NOTE: latest_file_import_attempt is None if all of this FI's FIAs are deleted
     def condensed_errors_by_row_as_dicts(self):
+        if self.latest_file_import_attempt is None:
+            return []
         return self.latest_file_import_attempt.condensed_errors_by_row_as_dicts()
 
     def errors_by_row_as_dict(self):
+        if self.latest_file_import_attempt is None:
+            return {}
         return self.latest_file_import_attempt.errors_by_row_as_dict()
 
     def condensed_errors_by_row(self):
@@ -328,18 +461,26 @@ class AbstractBaseFileImporter(TrackedFileMixin, ImportStatusModel, TrackedModel
 
     @property
     def file_changed(self):
+        if self.latest_file_import_attempt is None:
+            return True
         return self.hash_on_disk != self.latest_file_import_attempt.hash_when_imported
 
     @property
     def is_acknowledged(self):
+        if self.latest_file_import_attempt is None:
+            return False
         return self.latest_file_import_attempt.is_acknowledged
 
     @property
     def is_active(self):
+        if self.latest_file_import_attempt is None:
+            return False
         return self.latest_file_import_attempt.is_active
 
     @property
     def is_deleted(self):
+        if self.latest_file_import_attempt is None:
+            return False
         return self.latest_file_import_attempt.is_deleted
 
 
@@ -351,6 +492,7 @@ class AbstractBaseFileImportAttempt(
     PROPAGATED_FIELDS = ("status",)
 
     file_importer = NotImplemented
+    file_importer_batch = NotImplemented
 
     # TODO: Make this a FileField?
     imported_from = SensibleCharField(
@@ -374,6 +516,26 @@ class AbstractBaseFileImportAttempt(
         help_text="Headers that were ignored during import",
     )
     hash_when_imported = SensibleCharField(max_length=40, blank=True)
+    headers = ArrayField(
+        models.TextField(),
+        null=True,
+        blank=True,
+        help_text="If set, the headers of the file (in order), against which "
+        "compact Row Data store their values",
+    )
+    checkpoint = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="If set, this import is incomplete: this is the number of the "
+        "last row that was committed",
+    )
+    condensed_errors = JSONField(
+        encoder=DjangoErrorJSONEncoder,
+        null=True,
+        blank=True,
+        help_text="Cached result of derive_condensed_errors; set once the import "
+        "is complete",
+    )
 
     class Meta:
         abstract = True
@@ -393,6 +555,9 @@ class AbstractBaseFileImportAttempt(
                 .values_list("status", flat=True)
                 .first()
             )
+        elif FileImportAttemptArchive.objects.filter(file_import_attempt=self).exists():
+            # Archived FIAs have had their RDs removed, but keep their status
+            status = self.status
         else:
             status = self.STATUSES.empty.db_value
 
@@ -421,9 +586,15 @@ class AbstractBaseFileImportAttempt(
     def save(
         self, *args, derive_cached_values=True, propagate_derived_values=True, **kwargs
     ):
+        if propagate_derived_values and defer_propagation(self):
+            # Values will instead be derived (and propagated) in bulk later
+            derive_cached_values = propagate_derived_values = False
         if derive_cached_values:
             self.derive_cached_values()
+        created = self._state.adding
         super().save(*args, **kwargs)
+        if created:
+            set_as_latest_attempt(self, "file_importer", "latest_file_import_attempt")
 
         if propagate_derived_values:
             self.file_importer.save(propagate_derived_values=propagate_derived_values)
@@ -444,8 +615,10 @@ class AbstractBaseFileImportAttempt(
 
     # TODO: Unit tests!
     @transaction.atomic
-    def delete_imported_models(self, propagate=True):
-        """Delete all models imported by this FIA"""
+    def delete_imported_models(self, propagate=True, fast=False):
+        """Delete all models imported by this FIA
+
+        If fast is True, they are deleted via fast_delete"""
 
         num_deletions = 0
         deletions = Counter()
@@ -459,11 +632,7 @@ class AbstractBaseFileImportAttempt(
                     id__in=self.row_datas.values(
                         "model_importers__model_import_attempts__content_type"
                     )
-                )
-                .prefetch_related(
-                    "model_importers__model_import_attempts__content_type"
-                )
-                .distinct()
+                ).distinct()
             ]
             print(f"Derived model_classes_to_delete: {model_classes_to_delete}")
         # For every ContentType imported by this FIA...
@@ -472,7 +641,7 @@ class AbstractBaseFileImportAttempt(
                 model_import_attempt__model_importer__row_data__file_import_attempt=self
             )
             num_deletions_for_model_class, deletions_for_model_class = (
-                to_delete.delete()
+                fast_delete(to_delete) if fast else to_delete.delete()
             )
             num_deletions += num_deletions_for_model_class
             deletions += deletions_for_model_class
@@ -493,54 +662,61 @@ class AbstractBaseFileImportAttempt(
         return {form_map.get_name(): form_map.field_maps for form_map in form_maps}
 
     def condensed_errors_by_row_as_dicts(self):
-        error_report = self.errors_by_row_as_dict()
-        print(error_report)
-        error_to_row_nums = defaultdict(list)
-
-        condensed_errors = []
-        for row_num, error in error_report.items():
-            if "form_errors" in error:
-                for form_error in error["form_errors"]:
-                    condensed_errors.append(
-                        {
-                            "aliases": form_error["alias"],
-                            "error": f"{form_error['errors']}; got value '{form_error['value']}'",
-                            "error_type": "form",
-                            "row_num": row_num,
-                            # "value": form_error["value"],
-                        }
-                    )
-            if "conversion_errors" in error:
-                for conversion_error in error["conversion_errors"]:
-                    condensed_errors.append(
-                        {
-                            "aliases": tuple(
-                                alias
-                                for aliases in conversion_error["aliases"].values()
-                                for alias in aliases
-                            ),
-                            "error": conversion_error["error"],
-                            "error_type": "conversion",
-                            "row_num": row_num,
-                            # "value": conversion_error["value"],
-                        }
-                    )
+        """Return every distinct error in this FIA, along with the rows it occurred in
 
-        for condensed_error in condensed_errors:
-            row_num = condensed_error.pop("row_num")
-            error_to_row_nums[json.dumps(condensed_error)].append(row_num)
+        This is cached once the import is complete"""
+        if self.condensed_errors is not None:
+            return self.condensed_errors
+        return self.derive_condensed_errors()
 
-        condensed = [
-            {"row_nums": get_str_from_nums(row_nums), **json.loads(error)}
-            for error, row_nums in error_to_row_nums.items()
-        ]
+    def derive_condensed_errors(self):
+        """Condense this FIA's errors; see condensed_errors_by_row_as_dicts
+
+        All grouping is done by the DB"""
+
+        row_num = "model_import_attempt__model_importer__row_data__row_num"
+        condensed_errors = (
+            ModelImportAttemptError.objects.filter(
+                model_import_attempt__model_importer__row_data__file_import_attempt=self
+            )
+            .values("error_type", "aliases", "message", "value")
+            .annotate(
+                row_nums=ArrayAgg(row_num, distinct=True), first_row_num=Min(row_num)
+            )
+            .order_by("first_row_num")
+        )
+
+        condensed = []
+        for condensed_error in condensed_errors:
+            if condensed_error["error_type"] == "form":
+                messages = condensed_error["message"].split("\n")
+                error = f"{messages}; got value '{condensed_error['value']}'"
+            else:
+                error = condensed_error["message"]
+            condensed.append(
+                {
+                    "row_nums": get_str_from_nums(condensed_error["row_nums"]),
+                    "aliases": condensed_error["aliases"],
+                    "error": error,
+                    "error_type": condensed_error["error_type"],
+                }
+            )
         return condensed
 
     def errors_by_row_as_dict(self):
-        all_errors = ModelImportAttempt.objects.filter(
-            model_importer__row_data__file_import_attempt=self
-        ).values_list("model_importer__row_data__row_num", "errors")
-        error_report = {row_num: errors for row_num, errors in all_errors if errors}
+        # Rows are reported with the errors of their first MIA that has any,
+        # regardless of the order in which the DB happens to return them
+        all_errors = (
+            ModelImportAttempt.objects.filter(
+                model_importer__row_data__file_import_attempt=self
+            )
+            .order_by("id")
+            .values_list("model_importer__row_data__row_num", "errors")
+        )
+        error_report = {}
+        for row_num, errors in all_errors:
+            if errors:
+                error_report.setdefault(row_num, errors)
         return error_report
 
     def errors_by_row(self):
@@ -582,26 +758,27 @@ class AbstractBaseModelImporter(ImportStatusModel, TrackedModel):
         on_delete=models.CASCADE,
         help_text="Reference to the original data used to create this audit group",
     )
+    latest_model_import_attempt = models.ForeignKey(
+        "django_import_data.ModelImportAttempt",
+        related_name="+",
+        on_delete=SET_PREVIOUS_ATTEMPT,
+        null=True,
+        blank=True,
+        help_text="The most recent of this MI's MIAs. This is maintained as MIAs "
+        "are created",
+    )
 
     class Meta:
         abstract = True
 
-    @property
-    def latest_model_import_attempt(self):
-        return self.model_import_attempts.order_by("created_on").last()
-
     @property
     def importee_class(self):
         return self.latest_model_import_attempt.importee_class
 
     def derive_status(self):
         """MI status is the status of its most recent MIA"""
-        if self.model_import_attempts.exists():
-            status = (
-                self.model_import_attempts.order_by("-created_on")
-                .values_list("status", flat=True)
-                .first()
-            )
+        if self.latest_model_import_attempt_id:
+            status = self.latest_model_import_attempt.status
         else:
             status = self.STATUSES.empty.db_value
         return status
@@ -612,6 +789,9 @@ class AbstractBaseModelImporter(ImportStatusModel, TrackedModel):
     def save(
         self, *args, derive_cached_values=True, propagate_derived_values=True, **kwargs
     ):
+        if propagate_derived_values and defer_propagation(self):
+            # Values will instead be derived (and propagated) in bulk later
+            derive_cached_values = propagate_derived_values = False
         if derive_cached_values:
             self.derive_cached_values()
 
@@ -696,17 +876,24 @@ class AbstractBaseModelImportAttempt(TrackedModel, ImportStatusModel):
 
         return f"{self.content_type}: {self.STATUSES[self.status].value}"
 
+    def derive_status(self):
+        """MIA status is determined by whether it has any errors"""
+        if self.errors:
+            return ImportStatusModel.STATUSES.rejected.db_value
+
+        return ImportStatusModel.STATUSES.created_clean.db_value
+
     def save(
         self, *args, propagate_derived_values=True, derive_cached_values=False, **kwargs
     ):
         if self.status == ImportStatusModel.STATUSES.pending.db_value:
-            if self.errors:
-                self.status = ImportStatusModel.STATUSES.rejected.db_value
-            else:
-                self.status = ImportStatusModel.STATUSES.created_clean.db_value
+            self.status = self.derive_status()
 
+        created = self._state.adding
         super().save(*args, **kwargs)
-        if propagate_derived_values:
+        if created:
+            set_as_latest_attempt(self, "model_importer", "latest_model_import_attempt")
+        if propagate_derived_values and not defer_propagation(self.model_importer):
             self.model_importer.save(propagate_derived_values=propagate_derived_values)
 
     def summary(self):
@@ -807,6 +994,15 @@ class FileImporter(AbstractBaseFileImporter):
         null=True,
         blank=True,
     )
+    latest_file_import_attempt = models.ForeignKey(
+        "django_import_data.FileImportAttempt",
+        related_name="+",
+        on_delete=SET_PREVIOUS_ATTEMPT,
+        null=True,
+        blank=True,
+        help_text="The most recent of this FI's FIAs. This is maintained as FIAs "
+        "are created",
+    )
     objects = FileImporterManager()
 
     class Meta:
@@ -825,6 +1021,15 @@ class FileImportAttempt(AbstractBaseFileImportAttempt):
     file_importer = models.ForeignKey(
         FileImporter, related_name="file_import_attempts", on_delete=models.CASCADE
     )
+    # Unlike FileImporter.file_importer_batch, this never changes
+    file_importer_batch = models.ForeignKey(
+        FileImporterBatch,
+        related_name="file_import_attempts",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        help_text="The File Importer Batch that this was created by",
+    )
 
     objects = FileImportAttemptManager()
 
@@ -869,10 +1074,171 @@ class ModelImportAttempt(AbstractBaseModelImportAttempt):
         )
 
 
-# class ModelImportAttemptError(models.Model):
-#     model_import_attempt = models.OneToOneField(on_delete=models.CASCADE, unique=True)
-#     from_fields = SensibleCharField(max_length=256)
-#     from_field_
+class ModelImportAttemptError(models.Model):
+    """A single error encountered by a ModelImportAttempt
+
+    These duplicate the contents of ModelImportAttempt.errors, but in a form
+    that can be aggregated by the DB (rather than by walking every JSON blob
+    in Python). They are created in bulk alongside their MIAs"""
+
+    ERROR_TYPES = (("form", "Form"), ("conversion", "Conversion"))
+
+    model_import_attempt = models.ForeignKey(
+        ModelImportAttempt, related_name="error_records", on_delete=models.CASCADE
+    )
+    error_type = SensibleCharField(max_length=16, choices=ERROR_TYPES)
+    # Headers (and thus aliases) come from arbitrary source files, so none of
+    # these can be length-limited
+    field = SensibleTextField(blank=True, help_text="The form field that had the error")
+    alias = SensibleTextField(
+        blank=True,
+        help_text="The (first) header in the original data that the error relates to",
+    )
+    aliases = ArrayField(
+        SensibleTextField(),
+        default=list,
+        help_text="All headers in the original data that the error relates to",
+    )
+    from_fields = ArrayField(SensibleTextField(), default=list)
+    to_fields = ArrayField(SensibleTextField(), default=list)
+    converter = SensibleTextField(blank=True)
+    value = JSONField(encoder=DjangoErrorJSONEncoder, null=True, blank=True)
+    message = models.TextField(
+        help_text="The error itself. For form errors, this is each of the "
+        "field's errors, one per line"
+    )
+
+    class Meta:
+        verbose_name = "Model Import Attempt Error"
+        verbose_name_plural = "Model Import Attempt Errors"
+        indexes = [
+            models.Index(fields=["error_type", "field"]),
+            models.Index(fields=["alias"]),
+        ]
+
+    def __str__(self):
+        return f"{self.error_type} error for {self.alias or self.field}: {self.message}"
+
+    @classmethod
+    def from_model_import_attempt(cls, model_import_attempt):
+        """Return (unsaved) records of every error in model_import_attempt.errors"""
+
+        errors = model_import_attempt.errors or {}
+        records = []
+        for form_error in errors.get("form_errors", []):
+            aliases = form_error["alias"]
+            if isinstance(aliases, str):
+                aliases = [aliases]
+            records.append(
+                cls(
+                    model_import_attempt=model_import_attempt,
+                    error_type="form",
+                    field=form_error["field"],
+                    alias=aliases[0] if aliases else "",
+                    aliases=aliases,
+                    to_fields=[form_error["field"]],
+                    value=form_error["value"],
+                    message="\n".join(form_error["errors"]),
+                )
+            )
+        for conversion_error in errors.get("conversion_errors", []):
+            aliases = [
+                alias
+                for aliases in conversion_error["aliases"].values()
+                for alias in aliases
+            ]
+            records.append(
+                cls(
+                    model_import_attempt=model_import_attempt,
+                    error_type="conversion",
+                    alias=aliases[0] if aliases else "",
+                    aliases=aliases,
+                    from_fields=list(conversion_error["from_fields"]),
+                    to_fields=list(conversion_error["to_fields"]),
+                    converter=conversion_error["converter"],
+                    message=conversion_error["error"],
+                )
+            )
+        return records
+
+    def as_dict(self):
+        """Return this error as it appears in ModelImportAttempt.errors (sans aliases)"""
+
+        if self.error_type == "form":
+            return {
+                "field": self.field,
+                "value": self.value,
+                "errors": self.message.split("\n"),
+            }
+        return {
+            "error": self.message,
+            "converter": self.converter,
+            "to_fields": self.to_fields,
+            "from_fields": self.from_fields,
+        }
+
+
+class FileImportAttemptArchive(TrackedModel):
+    """A summary of a superseded FileImportAttempt, whose rows have been removed
+
+    See the compact_import_history command. The FIA itself is kept, so this
+    preserves its provenance (and, optionally, its raw rows) without keeping
+    its whole RowData/ModelImporter/ModelImportAttempt tree"""
+
+    COMPRESSIONS = (("gzip", "gzip"), ("zstd", "Zstandard"))
+
+    file_import_attempt = models.OneToOneField(
+        FileImportAttempt, related_name="archive", on_delete=models.CASCADE
+    )
+    num_rows = models.PositiveIntegerField()
+    summary = JSONField(
+        encoder=DjangoErrorJSONEncoder,
+        default=dict,
+        help_text="Counts of the attempt's rows (by status) and audit models",
+    )
+    creations = JSONField(encoder=DjangoErrorJSONEncoder, default=dict, null=True)
+    condensed_errors = JSONField(encoder=DjangoErrorJSONEncoder, null=True)
+    rows = models.BinaryField(
+        null=True,
+        help_text="If set, the attempt's rows (as JSON), compressed via compression",
+    )
+    compression = SensibleCharField(max_length=8, choices=COMPRESSIONS, blank=True)
+
+    class Meta:
+        verbose_name = "File Import Attempt Archive"
+        verbose_name_plural = "File Import Attempt Archives"
+
+    def __str__(self):
+        return f"Archive of {self.file_import_attempt}"
+
+    @staticmethod
+    def compress_rows(rows, compression):
+        """Compress the given list of {row_num, data} dicts via compression"""
+
+        rows = json.dumps(rows, cls=DjangoJSONEncoder).encode("utf-8")
+        if compression == "gzip":
+            return gzip.compress(rows)
+        if compression == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd compression requires the zstandard package")
+            return zstandard.ZstdCompressor().compress(rows)
+        raise ValueError(f"Unknown compression: {compression!r}")
+
+    def load_rows(self):
+        """Return the archived list of {row_num, data} dicts (if any)"""
+
+        if self.rows is None:
+            return None
+        rows = bytes(self.rows)
+        if self.compression == "gzip":
+            rows = gzip.decompress(rows)
+        elif self.compression == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd decompression requires the zstandard package")
+            rows = zstandard.ZstdDecompressor().decompress(rows)
+        return json.loads(rows.decode("utf-8"))
+
+
 ### MODEL MIXINS ###
 
 
@@ -0,0 +1,94 @@
+"""Provides deferred_propagation: set-based propagation of derived values
+
+Normally, saving (for example) a RowData with propagate_derived_values=True
+immediately re-derives and saves its FIA, which in turn re-derives and saves
+its FI, and so on up to the FIB. When many instances are saved, this results
+in the same parents being re-derived over and over again.
+
+Within a deferred_propagation() block, such saves instead record the instance
+as "dirty". When the (outermost) block exits, every dirty instance is
+re-derived, and its changes propagated upwards, one level at a time: a single
+UPDATE per level derives the values of all dirty instances at that level,
+along with all parents of those dirtied by the level below.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+import threading
+
+from django.apps import apps
+from django.db import transaction
+
+# Every model whose values are derived from its children, from the bottom up,
+# along with the field that points to its parent
+PROPAGATION_ORDER = (
+    ("django_import_data.ModelImporter", "row_data"),
+    ("django_import_data.RowData", "file_import_attempt"),
+    ("django_import_data.FileImportAttempt", "file_importer"),
+    ("django_import_data.FileImporter", "file_importer_batch"),
+    ("django_import_data.FileImporterBatch", None),
+)
+
+_STATE = threading.local()
+
+
+def defer_propagation(instance):
+    """Mark instance as dirty, if propagation is currently being deferred
+
+    Return True if it was marked, in which case its values will be derived
+    (and propagated) when the deferral ends, so the caller must not bother to
+    do so. Otherwise, return False"""
+
+    dirty = getattr(_STATE, "dirty", None)
+    if dirty is None:
+        return False
+
+    # The instance is recorded (rather than its PK) since it might not be
+    # saved (and thus have a PK) yet
+    dirty[instance._meta.label].append(instance)
+    return True
+
+
+@transaction.atomic
+def propagate(dirty):
+    """Derive and propagate the values of the given dirty instances
+
+    dirty is a dict of {model label: instances}"""
+
+    parent_ids = set()
+    for label, parent_field in PROPAGATION_ORDER:
+        ids = parent_ids | {instance.pk for instance in dirty.get(label, [])}
+        ids.discard(None)
+        if not ids:
+            parent_ids = set()
+            continue
+
+        model = apps.get_model(label)
+        queryset = model.objects.filter(id__in=ids)
+        queryset.derive_values(propagate_derived_values=False)
+        if parent_field:
+            parent_ids = set(queryset.values_list(parent_field, flat=True))
+        else:
+            parent_ids = set()
+
+
+@contextmanager
+def deferred_propagation():
+    """Defer the propagation of derived values until the end of the block
+
+    Blocks can be nested; everything is propagated when the outermost exits.
+    If the block exits due to an exception, nothing is propagated"""
+
+    if getattr(_STATE, "dirty", None) is not None:
+        yield
+        return
+
+    _STATE.dirty = defaultdict(list)
+    try:
+        yield
+        dirty = _STATE.dirty
+        # Further saves (i.e. from propagation itself) must not be deferred
+        _STATE.dirty = None
+        propagate(dirty)
+    finally:
+        _STATE.dirty = None
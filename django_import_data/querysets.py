@@ -1,6 +1,6 @@
 """Querysets for django_import_data"""
 
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from tqdm import tqdm
 
@@ -17,9 +17,13 @@ from django.db.models import (
     Value,
     BooleanField,
     Max,
+    PositiveIntegerField,
 )
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 
+from .deletion import fast_delete
+
 
 class TrackedFileQueryset(QuerySet):
     """Contains operations for synchronizing with files on disk"""
@@ -41,11 +45,31 @@ class TrackedFileQueryset(QuerySet):
 
 
 class DerivedValuesQueryset(QuerySet):
+    def get_derived_status(self):
+        """Return a query (correlated via OuterRef) for each instance's derived status
+
+        This must be equivalent to the model's derive_status. If it returns
+        None, values are instead derived by saving every instance"""
+        return None
+
     @transaction.atomic
     def derive_values(self, propagate_derived_values=True):
-        for instance in tqdm(self, unit=self.model._meta.verbose_name):
-            # Derive any necessary values for the model, but don't propagate them!
-            instance.save(derive_cached_values=True, propagate_derived_values=False)
+        derived_status = self.get_derived_status()
+        if derived_status is None:
+            for instance in tqdm(self, unit=self.model._meta.verbose_name):
+                # Derive any necessary values for the model, but don't propagate them!
+                instance.save(derive_cached_values=True, propagate_derived_values=False)
+        else:
+            # Derive the status of every instance via a single UPDATE, rather
+            # than (at least) two SELECTs and an UPDATE per instance
+            self.update(
+                status=Coalesce(
+                    Subquery(derived_status),
+                    Value(self.model.STATUSES.empty.db_value),
+                    output_field=PositiveIntegerField(),
+                ),
+                propagate_derived_values=False,
+            )
 
         # Now we propagate them, all at once, at the end
         if propagate_derived_values and hasattr(self, "propagate_derived_values"):
@@ -56,7 +80,9 @@ class DerivedValuesQueryset(QuerySet):
     def update(self, *args, propagate_derived_values=True, **kwargs):
         result = super().update(*args, **kwargs)
         propagated_fields_being_updated = [
-            field for field in self.model.PROPAGATED_FIELDS if field in kwargs.keys()
+            field
+            for field in getattr(self.model, "PROPAGATED_FIELDS", ())
+            if field in kwargs.keys()
         ]
         if propagate_derived_values and propagated_fields_being_updated:
             tqdm.write(
@@ -70,6 +96,15 @@ class DerivedValuesQueryset(QuerySet):
 
 
 class FileImporterBatchQuerySet(DerivedValuesQueryset):
+    def get_derived_status(self):
+        """FIB status is the most severe status of its FIs"""
+        FileImporter = apps.get_model("django_import_data.FileImporter")
+        return (
+            FileImporter.objects.filter(file_importer_batch=OuterRef("pk"))
+            .order_by("-status")
+            .values("status")[:1]
+        )
+
     def annotate_num_file_importers(self):
         return self.annotate(num_file_importers=Count("file_importers", distinct=True))
 
@@ -101,6 +136,13 @@ class FileImporterBatchQuerySet(DerivedValuesQueryset):
 
 
 class FileImporterQuerySet(TrackedFileQueryset, DerivedValuesQueryset):
+    def get_derived_status(self):
+        """FI status is the status of its most recent FIA"""
+        FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
+        return FileImportAttempt.objects.filter(
+            id=OuterRef("latest_file_import_attempt")
+        ).values("status")
+
     @transaction.atomic
     def propagate_derived_values(self):
         FileImporterBatch = apps.get_model("django_import_data.FileImporterBatch")
@@ -108,15 +150,21 @@ class FileImporterQuerySet(TrackedFileQueryset, DerivedValuesQueryset):
             file_importers__in=self.values("id")
         ).distinct().derive_values()
 
-    def changed_files(self):
+    def set_latest_file_import_attempts(self):
+        """Point every FI at its most recent FIA, via a single UPDATE"""
         FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
+        latest_fia_id = (
+            FileImportAttempt.objects.filter(file_importer=OuterRef("pk"))
+            .order_by("-created_on")
+            .values("id")[:1]
+        )
+        return self.update(latest_file_import_attempt=Subquery(latest_fia_id))
+
+    def changed_files(self):
         FileImporter = apps.get_model("django_import_data.FileImporter")
-        latest = FileImportAttempt.objects.filter(
-            file_importer=OuterRef("pk")
-        ).order_by("-created_on")
-        changed_hashes = FileImporter.objects.annotate(
-            latest_hash=Subquery(latest.values("hash_when_imported")[:1])
-        ).exclude(hash_on_disk=F("latest_hash"))
+        changed_hashes = FileImporter.objects.exclude(
+            hash_on_disk=F("latest_file_import_attempt__hash_when_imported")
+        )
 
         changed_paths = FileImporter.objects.filter(hash_on_disk="")
 
@@ -124,13 +172,9 @@ class FileImporterQuerySet(TrackedFileQueryset, DerivedValuesQueryset):
         return changed
 
     def annotate_current_status(self):
-        FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
-        current_status = (
-            FileImportAttempt.objects.filter(file_importer=OuterRef("pk"))
-            .order_by("-created_on")
-            .values("current_status")[:1]
+        return self.annotate(
+            current_status=F("latest_file_import_attempt__current_status")
         )
-        return self.annotate(current_status=Subquery(current_status))
 
     def annotate_num_file_import_attempts(self):
         return self.annotate(
@@ -168,6 +212,15 @@ class FileImporterQuerySet(TrackedFileQueryset, DerivedValuesQueryset):
 
 
 class RowDataQuerySet(DerivedValuesQueryset):
+    def get_derived_status(self):
+        """RD status is the most severe status of its MIs"""
+        ModelImporter = apps.get_model("django_import_data.ModelImporter")
+        return (
+            ModelImporter.objects.filter(row_data=OuterRef("pk"))
+            .order_by("-status")
+            .values("status")[:1]
+        )
+
     @transaction.atomic
     def propagate_derived_values(self):
         FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
@@ -183,8 +236,40 @@ class RowDataQuerySet(DerivedValuesQueryset):
     def annotate_current_status(self):
         return self.annotate(current_status=F("file_import_attempt__current_status"))
 
+    @transaction.atomic
+    def delete_imported_models(self, fast=False):
+        """Delete all models imported from these RDs
+
+        If fast is True, they are deleted via fast_delete"""
+        ContentType = apps.get_model("contenttypes.ContentType")
+
+        num_deletions = 0
+        deletions = Counter()
+        # For every ContentType imported from these RDs...
+        for content_type in ContentType.objects.filter(
+            id__in=self.values("model_importers__model_import_attempts__content_type")
+        ).distinct():
+            # ...delete the models of that type that were imported from them
+            to_delete = content_type.model_class().objects.filter(
+                model_import_attempt__model_importer__row_data__in=self.values("id")
+            )
+            num_deletions_for_model_class, deletions_for_model_class = (
+                fast_delete(to_delete) if fast else to_delete.delete()
+            )
+            num_deletions += num_deletions_for_model_class
+            deletions += deletions_for_model_class
+
+        return (num_deletions, deletions)
+
 
 class ModelImporterQuerySet(DerivedValuesQueryset):
+    def get_derived_status(self):
+        """MI status is the status of its most recent MIA"""
+        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
+        return ModelImportAttempt.objects.filter(
+            id=OuterRef("latest_model_import_attempt")
+        ).values("status")
+
     @transaction.atomic
     def propagate_derived_values(self):
         RowData = apps.get_model("django_import_data.RowData")
@@ -192,6 +277,16 @@ class ModelImporterQuerySet(DerivedValuesQueryset):
             model_importers__in=self.values("id")
         ).distinct().derive_values()
 
+    def set_latest_model_import_attempts(self):
+        """Point every MI at its most recent MIA, via a single UPDATE"""
+        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
+        latest_mia_id = (
+            ModelImportAttempt.objects.filter(model_importer=OuterRef("pk"))
+            .order_by("-created_on")
+            .values("id")[:1]
+        )
+        return self.update(latest_model_import_attempt=Subquery(latest_mia_id))
+
     def annotate_num_model_import_attempts(self):
         return self.annotate(
             num_model_import_attempts=Count("model_import_attempts", distinct=True)
@@ -229,25 +324,13 @@ class ModelImporterQuerySet(DerivedValuesQueryset):
         )
 
     def annotate_latest_mia_errors(self):
-        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
-        latest_mia_errors = (
-            # Get all MIAs with same MI as the outer one
-            ModelImportAttempt.objects.filter(model_importer=OuterRef("id"))
-            .order_by("-created_on")
-            .values("errors")[:1]
-        )
-        return self.annotate(latest_mia_errors=Subquery(latest_mia_errors))
+        return self.annotate(latest_mia_errors=F("latest_model_import_attempt__errors"))
 
     def annotate_latest_mia_importee_field_data(self):
-        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
-        latest_mia_importee_field_data = (
-            # Get all MIAs with same MI as the outer one
-            ModelImportAttempt.objects.filter(model_importer=OuterRef("id"))
-            .order_by("-created_on")
-            .values("importee_field_data")[:1]
-        )
         return self.annotate(
-            latest_mia_importee_field_data=Subquery(latest_mia_importee_field_data)
+            latest_mia_importee_field_data=F(
+                "latest_model_import_attempt__importee_field_data"
+            )
         )
 
     def annotate_latest_mia_data(self):
@@ -257,6 +340,23 @@ class ModelImporterQuerySet(DerivedValuesQueryset):
 
 
 class FileImportAttemptQuerySet(DerivedValuesQueryset):
+    def get_derived_status(self):
+        """FIA status is the most severe status of its RDs"""
+        RowData = apps.get_model("django_import_data.RowData")
+        return (
+            RowData.objects.filter(file_import_attempt=OuterRef("pk"))
+            .order_by("-status")
+            .values("status")[:1]
+        )
+
+    def derive_values(self, propagate_derived_values=True):
+        # Archived FIAs (see compact_import_history) have no rows left to derive
+        # their statuses from, so they keep the statuses they were archived with
+        unarchived = self.filter(archive__isnull=True)
+        return DerivedValuesQueryset.derive_values(
+            unarchived, propagate_derived_values=propagate_derived_values
+        )
+
     @transaction.atomic
     def propagate_derived_values(self):
         FileImporter = apps.get_model("django_import_data.FileImporter")
@@ -270,17 +370,8 @@ class FileImportAttemptQuerySet(DerivedValuesQueryset):
         )
 
     def annotate_is_latest(self):
-        FileImportAttempt = apps.get_model("django_import_data.FileImportAttempt")
-        latest_fia_id = (
-            # Get all FIAs with same FI as the outer one
-            FileImportAttempt.objects.filter(
-                file_importer=OuterRef("file_importer__id")
-            )
-            .order_by("-created_on")
-            .values("id")[:1]
-        )
         return self.annotate(
-            latest_fia_id=Subquery(latest_fia_id),
+            latest_fia_id=F("file_importer__latest_file_import_attempt"),
             is_latest=Case_(
                 When(id=F("latest_fia_id"), then=Value(True)),
                 default=Value(False),
@@ -304,7 +395,7 @@ class ModelImportAttemptQuerySet(DerivedValuesQueryset):
         ModelImporter = apps.get_model("django_import_data.ModelImporter")
 
         ModelImporter.objects.filter(
-            id__in=self.values("id")
+            model_import_attempts__in=self.values("id")
         ).distinct().derive_values()
 
     def annotate_current_status(self):
@@ -314,19 +405,9 @@ class ModelImportAttemptQuerySet(DerivedValuesQueryset):
             )
         )
 
-    # TODO: WIP
     def annotate_is_latest(self):
-        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
-        latest_mia_id = (
-            # Get all MIAs with same MI as the outer one
-            ModelImportAttempt.objects.filter(
-                model_importer=OuterRef("model_importer__id")
-            )
-            .order_by("-created_on")
-            .values("id")[:1]
-        )
         return self.annotate(
-            latest_mia_id=Subquery(latest_mia_id),
+            latest_mia_id=F("model_importer__latest_model_import_attempt"),
             is_latest=Case_(
                 When(id=F("latest_mia_id"), then=Value(True)),
                 default=Value(False),
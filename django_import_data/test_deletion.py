@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from django.db.models.signals import post_delete
+
+from .deletion import get_fallback_reasons
+from .models import (
+    FileImportAttempt,
+    ModelImportAttempt,
+    ModelImportAttemptError,
+    RowData,
+)
+
+
+def receiver(**kwargs):
+    pass
+
+
+class TestFastDelete(TestCase):
+    def test_fallback_reasons(self):
+        self.assertEqual(get_fallback_reasons(RowData), [])
+        self.assertEqual(get_fallback_reasons(ModelImportAttempt), [])
+        self.assertEqual(get_fallback_reasons(FileImportAttempt), [])
+
+    def test_fallback_reasons_signals(self):
+        post_delete.connect(receiver, sender=ModelImportAttemptError)
+        try:
+            # Receivers for cascaded-to models prevent fast deletion, too
+            self.assertTrue(get_fallback_reasons(ModelImportAttemptError))
+            self.assertTrue(get_fallback_reasons(ModelImportAttempt))
+            self.assertTrue(get_fallback_reasons(RowData))
+        finally:
+            post_delete.disconnect(receiver, sender=ModelImportAttemptError)
@@ -131,6 +131,28 @@ class TestFieldMap(TestCase):
         expected = {"latitude": "11 22 33", "longitude": "44 55 66"}
         self.assertEqual(actual, expected)
 
+    def test_compile(self):
+        field_map = FieldMap(
+            to_fields=("location",),
+            converter=handle_location,
+            from_fields={"latitude": ["lat", "LAT"], "longitude": ["long", "LONG"]},
+        )
+        actual = field_map.compile(("potato", "long", "lat"))
+        expected = (
+            (("long", "longitude"), ("lat", "latitude")),
+            {"longitude": ["long"], "latitude": ["lat"]},
+        )
+        self.assertEqual(actual, expected)
+
+    def test_compile_multiple_aliases(self):
+        field_map = FieldMap(
+            to_fields=("location",),
+            converter=handle_location,
+            from_fields={"latitude": ["lat", "LAT"], "longitude": ["long", "LONG"]},
+        )
+        with self.assertRaisesRegex(TypeError, "More than one alias"):
+            field_map.compile(("lat", "LAT", "long"))
+
     def test_unknown_fields(self):
         data = {"latitude": "11 22 33", "longitude": "44 55 66", "potato": "POTATO"}
         field_map = FieldMap(
@@ -269,6 +291,55 @@ class TestOneToOneFieldMap(TestCase):
         expected = {"foo": data["Bar"]}
         self.assertEqual(actual, expected)
 
+    def test_render_many_unaliased_vectorized(self):
+        calls = []
+
+        def double(values):
+            calls.append(values)
+            if "bad" in values:
+                raise ValueError("bad value")
+            return [value * 2 for value in values]
+
+        field_map = OneToOneFieldMap(
+            from_field="foo", to_field="bar", converter=double, vectorized=True
+        )
+        actual = field_map.render_many_unaliased([{"foo": "a"}, {"foo": "b"}])
+        self.assertEqual(actual, [{"bar": "aa"}, {"bar": "bb"}])
+        self.assertEqual(calls, [["a", "b"]])
+
+        # If the batch fails, each value should be converted individually, so
+        # that the error is attributed to the correct row
+        actual = field_map.render_many_unaliased([{"foo": "a"}, {"foo": "bad"}])
+        self.assertEqual(actual[0], {"bar": "aa"})
+        self.assertIsInstance(actual[1], ValueError)
+
+    def test_cached_converter(self):
+        calls = []
+
+        def convert_flag(value):
+            calls.append(value)
+            if value not in ("Y", "N"):
+                raise ValueError(f"Invalid flag: {value}")
+            return value == "Y"
+
+        field_map = OneToOneFieldMap(
+            from_field="foo", to_field="bar", converter=convert_flag, cache_size=2
+        )
+        self.assertEqual(field_map.converter_name, "convert_flag")
+        for value in ["Y", "N", "Y", "Y"]:
+            field_map.render({"foo": value})
+        self.assertEqual(calls, ["Y", "N"])
+
+        # Errors should be cached, too
+        for __ in range(2):
+            with self.assertRaisesRegex(ValueError, "Invalid flag: X"):
+                field_map.render({"foo": "X"})
+        self.assertEqual(calls, ["Y", "N", "X"])
+        self.assertEqual(
+            field_map.get_converter_stats(),
+            {"hits": 3, "misses": 3, "size": 2, "maxsize": 2},
+        )
+
     def test_reject_multiple_alias_matches(self):
         data = {"Bar": "bar", "Baz": "baz", "Bat": "boo"}
         field_map = OneToOneFieldMap(from_field={"foo": ("Bar", "Baz")}, to_field="foo")
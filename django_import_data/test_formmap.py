@@ -1,7 +1,8 @@
 from pprint import pprint
 from unittest import TestCase
 
-from django.forms import CharField, Form
+from django.contrib.contenttypes.models import ContentType
+from django.forms import CharField, Form, ModelForm
 from . import (
     FormMap,
     FieldMap,
@@ -231,3 +232,47 @@ class FormMapTestCase(TestCase):
 
     def test_as_mermaid(self):
         print(self.form_map.as_mermaid())
+
+
+class ContentTypeForm(ModelForm):
+    class Meta:
+        model = ContentType
+        fields = ("app_label", "model")
+
+
+class LowercaseFieldMap(OneToOneFieldMap):
+    def render(self, data, **kwargs):
+        # Overrides render itself, rather than render_unaliased
+        return {self.to_field: data[self.from_field].lower()}
+
+
+class ContentTypeFormMap(FormMap):
+    field_maps = [
+        OneToOneFieldMap(from_field="app", to_field="app_label"),
+        LowercaseFieldMap(from_field="Model", to_field="model"),
+    ]
+    form_class = ContentTypeForm
+
+
+class OverriddenRenderTestCase(TestCase):
+    def setUp(self):
+        self.form_map = ContentTypeFormMap()
+
+    def test_overrides_render(self):
+        self.assertFalse(self.form_map.field_maps[0].overrides_render)
+        self.assertTrue(self.form_map.field_maps[1].overrides_render)
+
+    def test_render_dict(self):
+        actual, errors = self.form_map.render_dict({"app": "foo", "Model": "Bar"})
+        self.assertEqual(actual, {"app_label": "foo", "model": "bar"})
+        self.assertEqual(errors, [])
+
+    def test_render_dicts(self):
+        rows = [{"app": "foo", "Model": "Bar"}, {"app": "baz", "Model": "Qux"}]
+        self.assertEqual(
+            self.form_map.render_dicts(rows),
+            [
+                ({"app_label": "foo", "model": "bar"}, []),
+                ({"app_label": "baz", "model": "qux"}, []),
+            ],
+        )
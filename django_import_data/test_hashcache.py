@@ -0,0 +1,41 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+import os
+
+from .hashcache import FileHashCache
+from .utils import hash_file
+
+
+class TestFileHashCache(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "file")
+        with open(self.path, "w") as file:
+            file.write("foo")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unchanged_file_is_not_rehashed(self):
+        cache = FileHashCache()
+        self.assertEqual(cache.hash_file(self.path), hash_file(self.path))
+        with patch("django_import_data.hashcache.hash_file") as mock_hash_file:
+            self.assertEqual(cache.hash_file(self.path), hash_file(self.path))
+        mock_hash_file.assert_not_called()
+
+    def test_changed_file_is_rehashed(self):
+        cache = FileHashCache()
+        cache.hash_file(self.path)
+        with open(self.path, "w") as file:
+            file.write("foobar")
+        self.assertEqual(cache.hash_file(self.path), hash_file(self.path))
+
+    def test_persistence(self):
+        db_path = os.path.join(self.temp_dir.name, "hashes.sqlite3")
+        FileHashCache(db_path).hash_file(self.path)
+        with patch("django_import_data.hashcache.hash_file") as mock_hash_file:
+            self.assertEqual(
+                FileHashCache(db_path).hash_file(self.path), hash_file(self.path)
+            )
+        mock_hash_file.assert_not_called()
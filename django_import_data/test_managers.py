@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from psycopg2.extras import Json
+
+from .managers import to_copy_text
+
+
+class TestToCopyText(TestCase):
+    def test_null(self):
+        self.assertEqual(to_copy_text(None), "\\N")
+
+    def test_scalars(self):
+        self.assertEqual(to_copy_text(1), "1")
+        self.assertEqual(to_copy_text(True), "t")
+        self.assertEqual(to_copy_text(False), "f")
+
+    def test_escaping(self):
+        self.assertEqual(to_copy_text("a\tb\nc\rd\\e"), "a\\tb\\nc\\rd\\\\e")
+
+    def test_json(self):
+        self.assertEqual(
+            to_copy_text(Json({"a": "b\tc", "d": None})), '{"a": "b\\\\tc", "d": null}'
+        )
+
+    def test_unadapted(self):
+        with self.assertRaises(TypeError):
+            to_copy_text({"a": 1})
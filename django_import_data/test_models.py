@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from .models import FileImportAttempt, FileImportAttemptArchive, RowData
+
+
+class TestRowData(TestCase):
+    def setUp(self):
+        self.file_import_attempt = FileImportAttempt(headers=["foo", "bar"])
+        self.row_data = RowData(file_import_attempt=self.file_import_attempt)
+
+    def test_set_data_compact(self):
+        self.row_data.set_data({"foo": 1, "bar": 2}, self.file_import_attempt.headers)
+        self.assertIsNone(self.row_data.raw_data)
+        self.assertEqual(self.row_data.values, [1, 2])
+        self.assertEqual(self.row_data.data, {"foo": 1, "bar": 2})
+
+        # As it would be if loaded from the DB
+        row_data = RowData(
+            file_import_attempt=self.file_import_attempt, raw_data=None, values=[1, 2]
+        )
+        self.assertEqual(row_data.data, {"foo": 1, "bar": 2})
+
+    def test_set_data_not_compact(self):
+        for data in [{"bar": 2, "foo": 1}, {"foo": 1}, {"foo": 1, "bar": 2, "baz": 3}]:
+            self.row_data.set_data(data, self.file_import_attempt.headers)
+            self.assertEqual(self.row_data.raw_data, data)
+            self.assertIsNone(self.row_data.values)
+            self.assertEqual(self.row_data.data, data)
+
+        self.row_data.set_data({"foo": 1, "bar": 2})
+        self.assertEqual(self.row_data.raw_data, {"foo": 1, "bar": 2})
+
+    def test_data_kwarg(self):
+        row_data = RowData(data={"foo": 1})
+        self.assertEqual(row_data.raw_data, {"foo": 1})
+        self.assertEqual(row_data.data, {"foo": 1})
+
+
+class TestFileImportAttemptArchive(TestCase):
+    def test_rows(self):
+        rows = [{"row_num": 2, "data": {"foo": "bar"}}]
+        archive = FileImportAttemptArchive(
+            rows=FileImportAttemptArchive.compress_rows(rows, "gzip"),
+            compression="gzip",
+        )
+        self.assertEqual(archive.load_rows(), rows)
+        self.assertIsNone(FileImportAttemptArchive().load_rows())
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            FileImportAttemptArchive.compress_rows([], "foo")
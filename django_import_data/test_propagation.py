@@ -0,0 +1,33 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+
+from .propagation import defer_propagation, deferred_propagation
+
+
+class TestDeferredPropagation(TestCase):
+    def test_not_deferred(self):
+        self.assertFalse(defer_propagation(ContentType(id=1)))
+
+    @patch("django_import_data.propagation.propagate")
+    def test_deferred(self, propagate):
+        first = ContentType(id=1)
+        second = ContentType(id=2)
+        with deferred_propagation():
+            self.assertTrue(defer_propagation(first))
+            with deferred_propagation():
+                self.assertTrue(defer_propagation(second))
+            # Only the outermost block propagates
+            propagate.assert_not_called()
+        propagate.assert_called_once_with({"contenttypes.ContentType": [first, second]})
+        self.assertFalse(defer_propagation(first))
+
+    @patch("django_import_data.propagation.propagate")
+    def test_not_propagated_on_error(self, propagate):
+        with self.assertRaises(ValueError):
+            with deferred_propagation():
+                defer_propagation(ContentType(id=1))
+                raise ValueError("foo")
+        propagate.assert_not_called()
+        self.assertFalse(defer_propagation(ContentType(id=1)))
@@ -0,0 +1,84 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import os
+
+from .utils import chunked, find_duplicate_files, hash_file, peek, reservoir_sample
+
+
+class TestPeek(TestCase):
+    def test_peek(self):
+        stream = (item for item in range(5))
+        first, iterator = peek(stream)
+        self.assertEqual(first, 0)
+        # The first item should still be available from the returned iterator
+        self.assertEqual(list(iterator), [0, 1, 2, 3, 4])
+
+    def test_peek_empty(self):
+        first, iterator = peek(iter([]))
+        self.assertIsNone(first)
+        self.assertEqual(list(iterator), [])
+
+
+class TestChunked(TestCase):
+    def test_chunked(self):
+        chunks = list(chunked((item for item in range(7)), 3))
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_chunked_empty(self):
+        self.assertEqual(list(chunked([], 3)), [])
+
+
+class TestReservoirSample(TestCase):
+    def test_sample_size(self):
+        sample = reservoir_sample((item for item in range(1000)), 10)
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(len(set(sample)), 10)
+
+    def test_sample_preserves_order(self):
+        sample = reservoir_sample((item for item in range(1000)), 50)
+        self.assertEqual(sample, sorted(sample))
+
+    def test_sample_larger_than_stream(self):
+        sample = reservoir_sample((item for item in range(3)), 10)
+        self.assertEqual(sample, [0, 1, 2])
+
+
+class TestFindDuplicateFiles(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_file(self, name, contents):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as file:
+            file.write(contents)
+        return path
+
+    def test_small_files(self):
+        a = self.make_file("a", b"foo")
+        b = self.make_file("b", b"foo")
+        self.make_file("c", b"bar")
+        self.make_file("d", b"fooo")
+        paths = sorted(os.path.join(self.temp_dir.name, name) for name in "abcd")
+        self.assertEqual(
+            find_duplicate_files(paths, quiet=True), {hash_file(a): [a, b]}
+        )
+
+    def test_large_files_with_same_ends(self):
+        # These share their first and last blocks, so only a full hash can
+        # tell them apart
+        block = b"x" * 16
+        a = self.make_file("a", block + b"1" * 64 + block)
+        b = self.make_file("b", block + b"2" * 64 + block)
+        c = self.make_file("c", block + b"1" * 64 + block)
+        self.assertEqual(
+            find_duplicate_files([a, b, c], block_size=16, quiet=True),
+            {hash_file(a): [a, c]},
+        )
+
+    def test_missing_files_are_ignored(self):
+        a = self.make_file("a", b"foo")
+        missing = os.path.join(self.temp_dir.name, "missing")
+        self.assertEqual(find_duplicate_files([a, missing], quiet=True), {})
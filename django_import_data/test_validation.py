@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from django.contrib.contenttypes.models import ContentType
+from django.forms import CharField, Form, ModelForm
+
+from .validation import CompiledFormValidator
+
+
+class AppLabelForm(ModelForm):
+    class Meta:
+        model = ContentType
+        fields = ["app_label"]
+
+
+class ContentTypeForm(ModelForm):
+    class Meta:
+        model = ContentType
+        fields = ["app_label", "model"]
+
+
+class CleaningAppLabelForm(AppLabelForm):
+    def clean_app_label(self):
+        return self.cleaned_data["app_label"].lower()
+
+
+class TestCompiledFormValidator(TestCase):
+    def assertSameAsForm(self, form_class, data):
+        form = form_class(data)
+        compiled_form = CompiledFormValidator(form_class).bind(data)
+        self.assertEqual(compiled_form.is_valid(), form.is_valid())
+        self.assertEqual(
+            {field: errors for field, errors in compiled_form.errors.items()},
+            {field: errors for field, errors in form.errors.items()},
+        )
+        for field in form.fields:
+            self.assertEqual(compiled_form[field].value(), form[field].value())
+        return compiled_form
+
+    def test_valid(self):
+        compiled_form = self.assertSameAsForm(AppLabelForm, {"app_label": "foo"})
+        self.assertEqual(compiled_form.save(commit=False).app_label, "foo")
+
+    def test_invalid(self):
+        self.assertSameAsForm(AppLabelForm, {"app_label": ""})
+        self.assertSameAsForm(AppLabelForm, {"app_label": "f" * 101})
+        compiled_form = CompiledFormValidator(AppLabelForm).bind({})
+        with self.assertRaises(ValueError):
+            compiled_form.save(commit=False)
+
+    def test_fallback_reasons(self):
+        class FooForm(Form):
+            foo = CharField()
+
+        self.assertEqual(CompiledFormValidator.get_fallback_reasons(AppLabelForm), [])
+        for form_class in [FooForm, ContentTypeForm, CleaningAppLabelForm]:
+            self.assertTrue(CompiledFormValidator.get_fallback_reasons(form_class))
+            with self.assertRaises(ValueError):
+                CompiledFormValidator(form_class)
+        self.assertTrue(
+            CompiledFormValidator.get_fallback_reasons(
+                AppLabelForm, form_kwargs={"instance": None}
+            )
+        )
@@ -1,12 +1,18 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, EnumMeta
+from itertools import chain, islice
 import hashlib
 import os
+import random
 import re
 from subprocess import CalledProcessError, check_output
 
 from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.gis.geos import Point
 
+from tqdm import tqdm
+
 
 class FancyEnumMeta(EnumMeta):
     def __getitem__(cls, key):
@@ -87,6 +93,130 @@ def hash_file(path):
     return sha1.hexdigest()
 
 
+def hash_file_ends(path, size, block_size=65536):
+    """Return the SHA-1 hash of the first and last block_size bytes of path
+
+    size must be the size of the file. If the file is no larger than two
+    blocks, the entire file is hashed (so the result is the same as that of
+    hash_file)"""
+
+    if size <= block_size * 2:
+        return hash_file(path)
+
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as file:
+        sha1.update(file.read(block_size))
+        file.seek(-block_size, os.SEEK_END)
+        sha1.update(file.read(block_size))
+    return sha1.hexdigest()
+
+
+def find_duplicate_files(
+    paths, block_size=65536, max_workers=None, quiet=False, hash_cache=None
+):
+    """Return a dict of {hash: paths} for files in paths with identical contents
+
+    This is done in stages, each of which narrows down the candidates for the
+    next: files are first grouped by size (a file with a unique size can't be
+    a duplicate), then by a hash of only their first and last block_size bytes,
+    and only then by a hash of their full contents. Hashing is done in a pool
+    of threads, since hashlib releases the GIL. Files that can't be found are
+    ignored.
+
+    If a FileHashCache is given as hash_cache, full hashes are taken from (and
+    stored in) it"""
+
+    full_hash = hash_cache.hash_file if hash_cache else hash_file
+
+    def group_by_hash(groups, hasher, desc):
+        jobs = [(key, path) for key, group in groups.items() for path in group]
+        hashes = executor.map(lambda job: hasher(*job), jobs)
+        paths_by_hash = defaultdict(list)
+        for (key, path), file_hash in tqdm(
+            zip(jobs, hashes), total=len(jobs), desc=desc, unit="file", disable=quiet
+        ):
+            paths_by_hash[(key, file_hash)].append(path)
+        return {key: group for key, group in paths_by_hash.items() if len(group) > 1}
+
+    paths_by_size = defaultdict(list)
+    for path in paths:
+        try:
+            paths_by_size[os.stat(path).st_size].append(path)
+        except OSError:
+            continue
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        candidates = group_by_hash(
+            {size: group for size, group in paths_by_size.items() if len(group) > 1},
+            lambda size, path: (
+                full_hash(path)
+                if size <= block_size * 2
+                else hash_file_ends(path, size, block_size=block_size)
+            ),
+            desc="Hashing file ends",
+        )
+        # Files no larger than two blocks have already been hashed in full
+        duplicates = {
+            file_hash: group
+            for (size, file_hash), group in candidates.items()
+            if size <= block_size * 2
+        }
+        full_hash_candidates = {
+            key: group for key, group in candidates.items() if key[0] > block_size * 2
+        }
+        for (__, file_hash), group in group_by_hash(
+            full_hash_candidates,
+            lambda key, path: full_hash(path),
+            desc="Hashing full files",
+        ).items():
+            duplicates[file_hash] = group
+
+    return duplicates
+
+
+def peek(iterable):
+    """Return the first item of iterable along with an equivalent, unconsumed iterator
+
+    If iterable is empty, the first item is None"""
+
+    iterator = iter(iterable)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return None, iter([])
+    return first, chain([first], iterator)
+
+
+def chunked(iterable, size):
+    """Yield successive lists of (at most) size items from iterable"""
+
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def reservoir_sample(iterable, k):
+    """Randomly select k items from iterable, preserving their original order
+
+    Only k items are held in memory at any given time, so this is suitable for
+    sampling from streams of unknown (or very large) length. If iterable
+    contains k or fewer items, all of them are returned"""
+
+    reservoir = []
+    for index, item in enumerate(iterable):
+        if index < k:
+            reservoir.append((index, item))
+        else:
+            replace_index = random.randint(0, index)
+            if replace_index < k:
+                reservoir[replace_index] = (index, item)
+
+    return [item for __, item in sorted(reservoir, key=lambda pair: pair[0])]
+
+
 # Modified from: http://stackoverflow.com/a/323910/1883424
 def itemAndNext(iterable):
     """Generator to yield an item and the next item.
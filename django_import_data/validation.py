@@ -0,0 +1,232 @@
+"""Provides CompiledFormValidator: ModelForm validation without per-row ModelForms
+
+Instantiating a ModelForm deep-copies every one of its fields, which is a
+significant cost when done once per row. CompiledFormValidator instead
+instantiates its form class once, up front, and then applies that form's
+field clean() chain and the model's field validation directly to each row of
+rendered data. The results are exposed via CompiledForm, which behaves like a
+bound ModelForm as far as FormMap is concerned.
+
+This is only equivalent to ModelForm validation for "plain" ModelForms, so
+CompiledFormValidator.get_fallback_reasons should be consulted first: if it
+returns anything, a real ModelForm must be used instead.
+"""
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import models
+from django.forms import BaseModelForm, FileField, ModelMultipleChoiceField
+from django.forms.models import construct_instance
+from django.forms.utils import ErrorDict, ErrorList
+
+# The ModelForm methods that our validation is equivalent to. If a form class
+# overrides any of these, we can't use a compiled validator for it
+MODEL_FORM_VALIDATION_METHODS = (
+    "__init__",
+    "full_clean",
+    "_clean_fields",
+    "_clean_form",
+    "_post_clean",
+    "clean",
+    "validate_unique",
+    "_get_validation_exclusions",
+    "_update_errors",
+)
+# Likewise for the model's validation methods
+MODEL_VALIDATION_METHODS = ("full_clean", "clean_fields", "clean")
+
+
+class CompiledBoundField:
+    """The subset of BoundField that FormMap (and construct_instance) use"""
+
+    def __init__(self, form, name):
+        self.form = form
+        self.name = name
+        self.field = form.fields[name]
+
+    def value(self):
+        return self.field.prepare_value(
+            self.field.widget.value_from_datadict(self.form.data, {}, self.name)
+        )
+
+
+class CompiledForm:
+    """The result of validating a single row of data with a CompiledFormValidator
+
+    This has the same interface as a bound ModelForm, as far as FormMap is
+    concerned: data, errors, is_valid(), save(), and form[field].value()"""
+
+    files = {}
+
+    def __init__(self, validator, data):
+        self.validator = validator
+        self.data = data
+        self.fields = validator.fields
+        self.Meta = validator.form_class.Meta
+        self.cleaned_data = None
+        self.instance = None
+        self._errors = None
+
+    def __getitem__(self, name):
+        return CompiledBoundField(self, name)
+
+    @staticmethod
+    def add_prefix(field_name):
+        return field_name
+
+    @property
+    def errors(self):
+        if self._errors is None:
+            self.full_clean()
+        return self._errors
+
+    def is_valid(self):
+        return not self.errors
+
+    def full_clean(self):
+        self._errors = ErrorDict()
+        self.cleaned_data = {}
+        for name, field in self.fields.items():
+            value = field.widget.value_from_datadict(self.data, self.files, name)
+            try:
+                self.cleaned_data[name] = field.clean(value)
+            except ValidationError as error:
+                self._errors[name] = ErrorList(error.error_list)
+
+        # Now mimic BaseModelForm._post_clean (minus validate_unique, which
+        # get_fallback_reasons guarantees is a no-op)
+        opts = self.validator.form_class._meta
+        exclude = self.get_validation_exclusions()
+        self.instance = opts.model()
+        try:
+            construct_instance(self, self.instance, opts.fields, opts.exclude)
+        except ValidationError as error:
+            self.update_errors(error)
+        try:
+            self.instance.full_clean(exclude=exclude, validate_unique=False)
+        except ValidationError as error:
+            self.update_errors(error)
+
+    def get_validation_exclusions(self):
+        """Equivalent to BaseModelForm._get_validation_exclusions"""
+
+        opts = self.validator.form_class._meta
+        exclude = []
+        for model_field in opts.model._meta.fields:
+            name = model_field.name
+            if name not in self.fields:
+                exclude.append(name)
+            elif opts.fields and name not in opts.fields:
+                exclude.append(name)
+            elif opts.exclude and name in opts.exclude:
+                exclude.append(name)
+            elif name in self._errors:
+                exclude.append(name)
+            else:
+                form_field = self.fields[name]
+                value = self.cleaned_data.get(name)
+                if (
+                    not model_field.blank
+                    and not form_field.required
+                    and value in form_field.empty_values
+                ):
+                    exclude.append(name)
+        return exclude
+
+    def update_errors(self, errors):
+        """Equivalent to BaseModelForm._update_errors (sans Meta.error_messages)"""
+
+        if hasattr(errors, "error_dict"):
+            error_dict = errors.error_dict
+        else:
+            error_dict = {NON_FIELD_ERRORS: errors.error_list}
+
+        for field, messages in error_dict.items():
+            if field in self.fields:
+                error_messages = self.fields[field].error_messages
+                for message in messages:
+                    if message.code in error_messages:
+                        message.message = error_messages[message.code]
+            elif field != NON_FIELD_ERRORS:
+                raise ValueError(f"'{self.Meta.model}' has no field named '{field}'")
+
+            self._errors.setdefault(field, ErrorList()).extend(messages)
+            self.cleaned_data.pop(field, None)
+
+    def save(self, commit=True):
+        if self.errors:
+            raise ValueError(
+                f"The {self.Meta.model._meta.object_name} could not be created "
+                "because the data didn't validate"
+            )
+        if commit:
+            self.instance.save()
+        return self.instance
+
+
+class CompiledFormValidator:
+    """Validates rendered data as form_class would, without instantiating it per row"""
+
+    def __init__(self, form_class):
+        reasons = self.get_fallback_reasons(form_class)
+        if reasons:
+            raise ValueError(
+                f"Can't compile a validator for {form_class.__name__}: {reasons}"
+            )
+
+        self.form_class = form_class
+        # Fields are deep-copied when a form is instantiated, so this is the
+        # only time that we need to pay for that
+        self.fields = form_class().fields
+
+    def bind(self, data):
+        return CompiledForm(self, data)
+
+    @classmethod
+    def get_fallback_reasons(cls, form_class, form_kwargs=None):
+        """Return a list of reasons that form_class can't be compiled
+
+        If this is empty, a CompiledFormValidator for form_class will produce the
+        same errors (and instances) as form_class itself would"""
+
+        if not (isinstance(form_class, type) and issubclass(form_class, BaseModelForm)):
+            return [f"{form_class} is not a ModelForm"]
+
+        reasons = []
+        if form_kwargs:
+            reasons.append(f"form_kwargs were given: {form_kwargs}")
+        for method in MODEL_FORM_VALIDATION_METHODS:
+            if getattr(form_class, method) is not getattr(BaseModelForm, method):
+                reasons.append(f"{form_class.__name__}.{method} is overridden")
+        opts = form_class._meta
+        if opts.error_messages:
+            reasons.append("Meta.error_messages is given")
+
+        for name, field in form_class.base_fields.items():
+            if hasattr(form_class, f"clean_{name}"):
+                reasons.append(f"{form_class.__name__}.clean_{name} is defined")
+            if field.disabled:
+                reasons.append(f"Field {name} is disabled")
+            if isinstance(field, (FileField, ModelMultipleChoiceField)):
+                reasons.append(f"Field {name} is a {field.__class__.__name__}")
+            if callable(getattr(field, "get_limit_choices_to", None)) and callable(
+                field.limit_choices_to
+            ):
+                reasons.append(f"Field {name} has a callable limit_choices_to")
+
+        model = opts.model
+        for method in MODEL_VALIDATION_METHODS:
+            if getattr(model, method) is not getattr(models.Model, method):
+                reasons.append(f"{model.__name__}.{method} is overridden")
+        # Uniqueness checks require DB queries per row, so there's nothing to
+        # be gained here
+        unique_checks, date_checks = model()._get_unique_checks(
+            exclude=[
+                field.name
+                for field in model._meta.fields
+                if field.name not in form_class.base_fields
+            ]
+        )
+        if unique_checks or date_checks:
+            reasons.append(f"{model.__name__} has unique constraints on form fields")
+
+        return reasons
@@ -241,7 +241,11 @@ def changed_files_view(request):
 
         return HttpResponseRedirect(request.path)
 
-    changed_files = FileImporter.objects.all().changed_files()
+    changed_files = (
+        FileImporter.objects.all()
+        .changed_files()
+        .select_related("latest_file_import_attempt")
+    )
     most_recent_check_time = (
         FileImporter.objects.order_by("hash_checked_on")
         .values_list("hash_checked_on", flat=True)
@@ -0,0 +1,179 @@
+"""Provides AuditWriter: a means of creating audit models in bulk"""
+
+from django.apps import apps
+
+from .propagation import defer_propagation
+
+
+class AuditWriter:
+    """Queues ModelImporters/ModelImportAttempts and creates them in bulk
+
+    If a FormMap is given an AuditWriter, save_with_audit hands it the audit
+    models for each attempt instead of creating them itself. Nothing is written
+    until flush is called (typically once per batch of rows), at which point
+    all queued ModelImporters are created with a single bulk INSERT, then all
+    queued ModelImportAttempts (and their ModelImportAttemptErrors). The
+    ModelImporters are then pointed at their attempts with a single bulk
+    UPDATE, as are the importees (one per model class).
+
+    If defer_importees is True, the importees themselves are also queued
+    (unsaved) rather than being saved by save_with_audit. They are then
+    created with a single bulk INSERT per model class when the writer is
+    flushed. Any dependencies between importees (e.g. a Case that needs the
+    PK of its applicant Person) are resolved at that point, by creating the
+    importees of each model class only after those of the classes they depend
+    upon. Since the dependencies don't exist when the importees' forms are
+    validated, they must not be required by those forms. Once set, their PKs
+    are recorded in the importee_field_data of the importees' MIAs. Note that
+    post_save signals are NOT sent for bulk-created importees.
+
+    NOTE: This relies on the database backend returning the PKs of
+    bulk-created rows (as Postgres does)"""
+
+    def __init__(self, defer_importees=False):
+        self.defer_importees = defer_importees
+        self.pending = []
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, model, row_data, instance=None, depends_on=None, **kwargs):
+        """Queue an MI and MIA for the given row_data; return them (unsaved)
+
+        If instance is given, it is the importee that was created by this
+        attempt. It will be linked to the MIA when the writer is flushed
+        (and, if defer_importees is True, created then as well).
+
+        depends_on is a dict of {field: instance} that will be set on instance
+        just before it is created. It is only used if defer_importees is True"""
+
+        from django.contrib.contenttypes.models import ContentType
+
+        ModelImporter = apps.get_model("django_import_data.ModelImporter")
+        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
+
+        model_importer = ModelImporter(row_data=row_data)
+        model_import_attempt = ModelImportAttempt(
+            content_type=ContentType.objects.get_for_model(model), **kwargs
+        )
+        # bulk_create bypasses save(), so we need to derive this ourselves
+        model_import_attempt.status = model_import_attempt.derive_status()
+        self.pending.append(
+            (model_importer, model_import_attempt, instance, depends_on or {})
+        )
+        row_data.audit_results.append(model_import_attempt)
+        return model_importer, model_import_attempt
+
+    def flush(self):
+        """Create all queued audit models, and link them to their importees"""
+
+        if not self.pending:
+            return
+
+        ModelImporter = apps.get_model("django_import_data.ModelImporter")
+        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
+        ModelImportAttemptError = apps.get_model(
+            "django_import_data.ModelImportAttemptError"
+        )
+
+        ModelImporter.objects.bulk_create(
+            [model_importer for model_importer, __, __, __ in self.pending]
+        )
+        for model_importer, model_import_attempt, __, __ in self.pending:
+            # Now that the MI has a PK, we can point the MIA at it
+            model_import_attempt.model_importer = model_importer
+        ModelImportAttempt.objects.bulk_create(
+            [model_import_attempt for __, model_import_attempt, __, __ in self.pending]
+        )
+        # Each MIA is the latest attempt of its (new) MI
+        for model_importer, model_import_attempt, __, __ in self.pending:
+            model_importer.latest_model_import_attempt = model_import_attempt
+        ModelImporter.objects.bulk_update(
+            [model_importer for model_importer, __, __, __ in self.pending],
+            ["latest_model_import_attempt"],
+        )
+        # bulk_create bypasses save(), so the new MIs must be marked dirty
+        # ourselves (if propagation is being deferred) for their values (and
+        # those of their parents) to be derived
+        for model_importer, __, __, __ in self.pending:
+            defer_propagation(model_importer)
+        ModelImportAttemptError.objects.bulk_create(
+            [
+                error_record
+                for __, model_import_attempt, __, __ in self.pending
+                for error_record in ModelImportAttemptError.from_model_import_attempt(
+                    model_import_attempt
+                )
+            ]
+        )
+
+        importees_by_model = {}
+        for __, model_import_attempt, instance, depends_on in self.pending:
+            if instance is not None:
+                instance.model_import_attempt = model_import_attempt
+                importees_by_model.setdefault(type(instance), []).append(
+                    (instance, depends_on)
+                )
+
+        if self.defer_importees:
+            self._create_importees(importees_by_model)
+        else:
+            for model, importees in importees_by_model.items():
+                model._default_manager.bulk_update(
+                    [instance for instance, __ in importees], ["model_import_attempt"]
+                )
+
+        self.pending = []
+
+    def _create_importees(self, importees_by_model):
+        """Create the given importees, in dependency order"""
+
+        ModelImportAttempt = apps.get_model("django_import_data.ModelImportAttempt")
+        updated_model_import_attempts = []
+        while importees_by_model:
+            # A model class is ready to be created once all of the importees
+            # it depends upon have PKs
+            ready = [
+                model
+                for model, importees in importees_by_model.items()
+                if all(
+                    dependency is None or dependency.pk is not None
+                    for __, depends_on in importees
+                    for dependency in depends_on.values()
+                )
+            ]
+            if not ready:
+                raise ValueError(
+                    "Could not resolve dependencies between the pending importees "
+                    f"of {list(importees_by_model)}; are all dependencies being "
+                    "saved via this AuditWriter?"
+                )
+
+            for model in ready:
+                instances = []
+                for instance, depends_on in importees_by_model.pop(model):
+                    for field, dependency in depends_on.items():
+                        setattr(instance, field, dependency)
+                    if depends_on:
+                        # These weren't known when the MIA was created
+                        model_import_attempt = instance.model_import_attempt
+                        model_import_attempt.importee_field_data = {
+                            **model_import_attempt.importee_field_data,
+                            **{
+                                field: dependency.pk if dependency else None
+                                for field, dependency in depends_on.items()
+                            },
+                        }
+                        updated_model_import_attempts.append(model_import_attempt)
+                    instances.append(instance)
+
+                if model._meta.parents:
+                    # bulk_create doesn't support multi-table inheritance
+                    for instance in instances:
+                        instance.save()
+                else:
+                    model._default_manager.bulk_create(instances)
+
+        ModelImportAttempt.objects.bulk_update(
+            updated_model_import_attempts, ["importee_field_data"]
+        )
@@ -30,8 +30,5 @@ class Command(BaseImportCommand):
         case, case_audit = CASE_FORM_MAP.save_with_audit(
             row_data=row_data,
             imported_by=self.__module__,
-            extra={
-                "applicant": applicant.id if applicant else None,
-                "structure": structure.id if structure else None,
-            },
+            depends_on={"applicant": applicant, "structure": structure},
         )
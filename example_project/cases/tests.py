@@ -1,10 +1,17 @@
-from collections import OrderedDict
+from collections import Counter, OrderedDict
+from contextlib import redirect_stdout
 from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import mock
+import csv
+import os
 
 from django.test import TestCase
 
 from django_import_data import FormMapSet
+from django_import_data.deletion import fast_delete, get_fallback_reasons
 from django_import_data.formmapset import flatten_dependencies
+from django_import_data.writers import AuditWriter
 from django.contrib.contenttypes.models import ContentType
 
 from .models import Case, Person, Structure
@@ -15,10 +22,11 @@ from importers.example_data_source.form_maps import (
 )
 from cases.management.commands.import_example_data import Command
 
-from .forms import StructureForm
+from .forms import CaseForm, StructureForm
 from django_import_data.models import (
     FileImporter,
     FileImportAttempt,
+    FileImportAttemptArchive,
     FileImporterBatch,
     RowData,
     ModelImporter,
@@ -289,10 +297,12 @@ class TestSanity(TestCase):
                 # importees!
                 "cases.Case": 1,
                 "django_import_data.ModelImportAttempt": 2,
+                "django_import_data.ModelImportAttemptError": 0,
                 "cases.Structure": 1,
                 "django_import_data.ModelImporter": 2,
                 "django_import_data.RowData": 1,
                 "django_import_data.FileImportAttempt": 1,
+                "django_import_data.FileImportAttemptArchive": 0,
             },
         )
         actual_deletions = file_import_attempt.delete()
@@ -306,6 +316,83 @@ class TestSanity(TestCase):
         self.assertEqual(FileImportAttempt.objects.count(), 0)
 
 
+class TestFastDelete(TestCase):
+    def create_import(self, path):
+        """Create an FI with two FIAs, the latter of which imported a Case"""
+
+        file_importer, previous_attempt = FileImporter.objects.create_with_attempt(
+            path=path, importer_name="TestFastDelete"
+        )
+        # hash_on_disk is unique, so it can't be left blank for both FIs
+        FileImporter.objects.filter(id=file_importer.id).update(hash_on_disk=path)
+        file_import_attempt = FileImportAttempt.objects.create(
+            imported_from=path, file_importer=file_importer
+        )
+        row_data = RowData.objects.create(
+            file_import_attempt=file_import_attempt, row_num=0, data={"foo": "bar"}
+        )
+        __, person_import_attempt = ModelImporter.objects.create_with_attempt(
+            model=Person,
+            row_data=row_data,
+            importee_field_data={"foo": "bar"},
+            errors={},
+            error_summary={},
+            imported_by="TestFastDelete",
+        )
+        person = Person.objects.create(
+            name="Foo", model_import_attempt=person_import_attempt
+        )
+        __, case_import_attempt = ModelImporter.objects.create_with_attempt(
+            model=Case,
+            row_data=row_data,
+            importee_field_data={"foo": "bar"},
+            errors={},
+            error_summary={},
+            imported_by="TestFastDelete",
+        )
+        Case.objects.create(
+            case_num=123,
+            applicant=person,
+            subtype=1,
+            model_import_attempt=case_import_attempt,
+        )
+        return file_importer, previous_attempt
+
+    def test_fast_delete(self):
+        # Otherwise, fast_delete would simply fall back to QuerySet.delete()
+        self.assertEqual(get_fallback_reasons(FileImportAttempt), [])
+        file_importer, previous_attempt = self.create_import("/foo/slow.txt")
+        fast_file_importer, fast_previous_attempt = self.create_import("/foo/fast.txt")
+
+        # These filter on RowData, which are deleted before the FIAs themselves
+        expected_deletions = FileImportAttempt.objects.filter(
+            imported_from="/foo/slow.txt", row_datas__row_num=0
+        ).delete()
+        actual_deletions = fast_delete(
+            FileImportAttempt.objects.filter(
+                imported_from="/foo/fast.txt", row_datas__row_num=0
+            )
+        )
+        # QuerySet.delete() reports the (fast-deleted) models it found nothing
+        # to delete in, whereas fast_delete() doesn't necessarily; ignore those
+        self.assertEqual(
+            (actual_deletions[0], +actual_deletions[1]),
+            (expected_deletions[0], +Counter(expected_deletions[1])),
+        )
+        self.assertEqual(actual_deletions[1]["cases.Case"], 1)
+        self.assertEqual(actual_deletions[1]["cases.Person"], 1)
+
+        # Both FIs have fallen back to their previous attempts
+        file_importer.refresh_from_db()
+        self.assertEqual(file_importer.latest_file_import_attempt, previous_attempt)
+        fast_file_importer.refresh_from_db()
+        self.assertEqual(
+            fast_file_importer.latest_file_import_attempt, fast_previous_attempt
+        )
+        self.assertEqual(Case.objects.count(), 0)
+        self.assertEqual(FileImportAttempt.objects.count(), 2)
+
+
 from django.core.management import call_command
 
 
@@ -604,3 +691,499 @@ class TestImportExampleData(TestCase):
         )
 
         self._test_file_with_no_rows()
+
+
+class CsvImportTestCase(TestCase):
+    """Base class for tests that import CSV files written to a temporary dir"""
+
+    HEADERS = [
+        "first_name",
+        "middle_name",
+        "last_name",
+        "email",
+        "case_num",
+        "completed",
+        "type",
+        "address",
+        "latitude",
+        "longitude",
+        "phone",
+    ]
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    @staticmethod
+    def make_row(num, **kwargs):
+        """Return a row for a Person, Structure and Case that are unique to num"""
+
+        return {
+            "first_name": f"Foo{num}",
+            "middle_name": "Bar",
+            "last_name": "Baz",
+            "email": f"foo{num}@bar.baz",
+            "case_num": str(num),
+            "completed": "TRUE",
+            "type": "A 1",
+            "address": "123 Foobar St, Atlanta, GA, 30078",
+            "latitude": f"38.{num}",
+            "longitude": "78.1",
+            "phone": "123456789",
+            **kwargs,
+        }
+
+    def write_csv(self, name, rows):
+        """Write the given rows to a CSV file in the temporary dir; return its path"""
+
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", newline="", encoding="latin1") as file:
+            writer = csv.DictWriter(file, fieldnames=self.HEADERS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+
+class TestResume(CsvImportTestCase):
+    def test_resume(self):
+        path = self.write_csv("resume.csv", [self.make_row(num) for num in range(1, 6)])
+        handle_record = Command.handle_record
+
+        def handle_record_until_row_4(command, row_data, **kwargs):
+            if row_data.row_num == 4:
+                raise RuntimeError("Killed")
+            return handle_record(command, row_data, **kwargs)
+
+        output = StringIO()
+        with mock.patch.object(
+            Command,
+            "handle_record",
+            autospec=True,
+            side_effect=handle_record_until_row_4,
+        ), redirect_stdout(output):
+            with self.assertRaisesRegex(RuntimeError, "Killed"):
+                call_command("import_example_data", path, commit_every=1)
+        # A new FIA isn't being resumed, even though it has a checkpoint
+        self.assertNotIn("Resuming", output.getvalue())
+
+        # Rows 2 and 3 were committed before row 4 was reached
+        file_import_attempt = FileImportAttempt.objects.get()
+        self.assertEqual(file_import_attempt.checkpoint, 3)
+        self.assertEqual(
+            sorted(file_import_attempt.row_datas.values_list("row_num", flat=True)),
+            [2, 3],
+        )
+        self.assertEqual(Person.objects.count(), 2)
+
+        output = StringIO()
+        with redirect_stdout(output):
+            call_command("import_example_data", path, commit_every=1, resume=True)
+        self.assertIn(
+            f"Resuming FIA {file_import_attempt.id} after row 3", output.getvalue()
+        )
+
+        # The same FIA was completed, without duplicating any rows
+        file_import_attempt = FileImportAttempt.objects.get()
+        self.assertIsNone(file_import_attempt.checkpoint)
+        self.assertEqual(
+            sorted(file_import_attempt.row_datas.values_list("row_num", flat=True)),
+            [2, 3, 4, 5, 6],
+        )
+        self.assertEqual(
+            sorted(Case.objects.values_list("case_num", flat=True)), [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(Person.objects.count(), 5)
+        self.assertEqual(ModelImporter.objects.count(), 15)
+
+
+class RequiredApplicantCaseForm(CaseForm):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["applicant"].required = True
+
+
+class RequiredApplicantCaseFormMap(CaseFormMap):
+    form_class = RequiredApplicantCaseForm
+
+
+class TestDeferImportees(CsvImportTestCase):
+    def test_defer_importees(self):
+        path = self.write_csv("defer.csv", [self.make_row(1), self.make_row(2)])
+        call_command("import_example_data", path, defer_importees=True)
+
+        self.assertEqual(Case.objects.count(), 2)
+        for case in Case.objects.all():
+            # The dependencies were created first, and then set on the Case
+            self.assertEqual(case.applicant.name, f"Foo{case.case_num} Bar Baz")
+            self.assertEqual(case.structure.location, f"(38.{case.case_num}, 78.1)")
+            # ...all from the same row
+            row_data = case.model_import_attempt.model_importer.row_data
+            self.assertEqual(
+                case.applicant.model_import_attempt.model_importer.row_data, row_data
+            )
+            self.assertEqual(
+                case.structure.model_import_attempt.model_importer.row_data, row_data
+            )
+            # The PKs of the dependencies are recorded along with the form data
+            importee_field_data = case.model_import_attempt.importee_field_data
+            self.assertEqual(importee_field_data["applicant"], case.applicant.id)
+            self.assertEqual(importee_field_data["structure"], case.structure.id)
+            self.assertEqual(importee_field_data["case_num"], case.case_num)
+
+    def test_required_dependency(self):
+        row_data = RowData(row_num=2, data=self.make_row(1))
+        with self.assertRaisesRegex(ValueError, r"\['applicant'\] can't be deferred"):
+            RequiredApplicantCaseFormMap().save_with_audit(
+                row_data,
+                imported_by="TestDeferImportees",
+                audit_writer=AuditWriter(defer_importees=True),
+                depends_on={"applicant": Person()},
+            )
+
+
+class TestIncremental(CsvImportTestCase):
+    def test_incremental(self):
+        rows = [self.make_row(1), self.make_row(2), self.make_row(3)]
+        path = self.write_csv("incremental.csv", rows)
+        call_command("import_example_data", path)
+        previous_attempt = FileImportAttempt.objects.get()
+        row_data_ids = dict(previous_attempt.row_datas.values_list("row_num", "id"))
+        person_ids = dict(Person.objects.values_list("name", "id"))
+
+        # Change only the second row (i.e. row 3, after the header)
+        rows[1] = self.make_row(2, first_name="Changed")
+        self.write_csv("incremental.csv", rows)
+        call_command("import_example_data", path, incremental=True)
+
+        file_import_attempt = FileImporter.objects.get().latest_file_import_attempt
+        self.assertNotEqual(file_import_attempt, previous_attempt)
+        previous_attempt.refresh_from_db()
+        self.assertEqual(
+            previous_attempt.current_status,
+            FileImportAttempt.CURRENT_STATUSES.deleted.db_value,
+        )
+        # Only the changed row is left behind, and its models were deleted
+        self.assertEqual(
+            list(previous_attempt.row_datas.values_list("id", flat=True)),
+            [row_data_ids[3]],
+        )
+        self.assertFalse(
+            Case.objects.filter(
+                model_import_attempt__model_importer__row_data__id=row_data_ids[3]
+            ).exists()
+        )
+
+        # The unchanged RDs (and their models) were carried forward...
+        new_row_data_ids = dict(
+            file_import_attempt.row_datas.values_list("row_num", "id")
+        )
+        self.assertEqual(new_row_data_ids[2], row_data_ids[2])
+        self.assertEqual(new_row_data_ids[4], row_data_ids[4])
+        self.assertEqual(
+            Person.objects.get(name="Foo1 Bar Baz").id, person_ids["Foo1 Bar Baz"]
+        )
+        self.assertEqual(
+            Person.objects.get(name="Foo3 Bar Baz").id, person_ids["Foo3 Bar Baz"]
+        )
+        # ...while only the changed row was re-imported
+        self.assertNotEqual(new_row_data_ids[3], row_data_ids[3])
+        self.assertFalse(Person.objects.filter(name="Foo2 Bar Baz").exists())
+        self.assertEqual(
+            Person.objects.get(
+                name="Changed Bar Baz"
+            ).model_import_attempt.model_importer.row_data_id,
+            new_row_data_ids[3],
+        )
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(Case.objects.count(), 3)
+        # The changed row's audit models are kept on the previous FIA
+        self.assertEqual(ModelImporter.objects.count(), 12)
+
+
+class TestDeriveValues(TestCase):
+    STATUSES = FileImporter.STATUSES
+
+    def create_model_importer(self, row_data, errors=None):
+        ModelImporter.objects.create_with_attempt(
+            model=Person,
+            row_data=row_data,
+            importee_field_data={},
+            errors=errors or {},
+            error_summary={},
+            imported_by="TestDeriveValues",
+        )
+
+    def create_file_import_attempt(self, file_importer_batch, name):
+        file_importer = FileImporter.objects.create(
+            file_importer_batch=file_importer_batch,
+            importer_name="TestDeriveValues",
+            file_path=f"/foo/{name}.csv",
+            # hash_on_disk must be unique
+            hash_on_disk=name,
+        )
+        return FileImportAttempt.objects.create(
+            file_importer=file_importer, imported_from=file_importer.file_path
+        )
+
+    def test_derive_values(self):
+        file_importer_batch = FileImporterBatch.objects.create(
+            command="test", args=[], kwargs={}
+        )
+        # A rejected row, a clean row, and a row that imported nothing
+        mixed = self.create_file_import_attempt(file_importer_batch, "mixed")
+        rejected_row = RowData.objects.create(
+            file_import_attempt=mixed, row_num=2, data={}
+        )
+        self.create_model_importer(rejected_row)
+        self.create_model_importer(
+            rejected_row,
+            errors={
+                "form_errors": [
+                    {"field": "email", "value": "", "errors": [], "alias": ["email"]}
+                ]
+            },
+        )
+        clean_row = RowData.objects.create(
+            file_import_attempt=mixed, row_num=3, data={}
+        )
+        self.create_model_importer(clean_row)
+        empty_row = RowData.objects.create(
+            file_import_attempt=mixed, row_num=4, data={}
+        )
+        # All clean rows
+        clean = self.create_file_import_attempt(file_importer_batch, "clean")
+        self.create_model_importer(
+            RowData.objects.create(file_import_attempt=clean, row_num=2, data={})
+        )
+        # No rows at all
+        empty = self.create_file_import_attempt(file_importer_batch, "empty")
+        # A batch without any files
+        empty_batch = FileImporterBatch.objects.create(
+            command="test", args=[], kwargs={}
+        )
+
+        querysets = [
+            ModelImporter.objects.all(),
+            RowData.objects.all(),
+            FileImportAttempt.objects.all(),
+            FileImporter.objects.all(),
+            FileImporterBatch.objects.all(),
+        ]
+        for queryset in querysets:
+            queryset.update(
+                status=self.STATUSES.pending.db_value, propagate_derived_values=False
+            )
+        # Derive each level from the bottom up, as propagation does
+        for queryset in querysets:
+            queryset.derive_values(propagate_derived_values=False)
+
+        def get_status(instance):
+            instance.refresh_from_db()
+            return self.STATUSES[instance.status]
+
+        self.assertEqual(get_status(rejected_row), self.STATUSES.rejected)
+        self.assertEqual(get_status(clean_row), self.STATUSES.created_clean)
+        self.assertEqual(get_status(empty_row), self.STATUSES.empty)
+        self.assertEqual(get_status(mixed), self.STATUSES.rejected)
+        self.assertEqual(get_status(clean), self.STATUSES.created_clean)
+        self.assertEqual(get_status(empty), self.STATUSES.empty)
+        self.assertEqual(get_status(mixed.file_importer), self.STATUSES.rejected)
+        self.assertEqual(get_status(clean.file_importer), self.STATUSES.created_clean)
+        self.assertEqual(get_status(empty.file_importer), self.STATUSES.empty)
+        self.assertEqual(get_status(file_importer_batch), self.STATUSES.rejected)
+        self.assertEqual(get_status(empty_batch), self.STATUSES.empty)
+
+        # The single UPDATE per level must agree with each instance's own
+        # derive_status at every level
+        for queryset in querysets:
+            for instance in queryset.all():
+                self.assertEqual(instance.status, instance.derive_status(), instance)
+
+
+class TestCopyCreate(TestCase):
+    def test_copy_create(self):
+        __, file_import_attempt = FileImporter.objects.create_with_attempt(
+            path="/foo/copy.csv", importer_name="TestCopyCreate"
+        )
+        rows = [
+            {"tab": "a\tb", "newline": "a\nb\r\nc", "backslash": "a\\b\\N"},
+            {"null": None, "empty": "", "literal_null": "\\N"},
+            {"non-ascii": "Füße ☃ 雪", "quote": "\"'"},
+        ]
+        row_datas = [
+            RowData(
+                file_import_attempt=file_import_attempt,
+                row_num=row_num,
+                content_hash=RowData.hash_data(row),
+                data=row,
+            )
+            for row_num, row in enumerate(rows, 2)
+        ]
+        # A RD created normally, so that the sequence has already been used
+        existing = RowData.objects.create(
+            file_import_attempt=file_import_attempt, row_num=1, data={}
+        )
+
+        created = RowData.objects.copy_create(row_datas)
+        self.assertEqual(len({row_data.pk for row_data in created}), len(rows))
+        self.assertNotIn(existing.pk, [row_data.pk for row_data in created])
+        for row_data, row in zip(created, rows):
+            from_db = RowData.objects.get(pk=row_data.pk)
+            self.assertEqual(from_db.data, row)
+            self.assertEqual(from_db.row_num, row_data.row_num)
+            self.assertEqual(from_db.content_hash, RowData.hash_data(row))
+            self.assertEqual(from_db.file_import_attempt, file_import_attempt)
+
+        # The sequence was advanced past the copied RDs
+        self.assertGreater(
+            RowData.objects.create(
+                file_import_attempt=file_import_attempt, row_num=5, data={}
+            ).pk,
+            max(row_data.pk for row_data in created),
+        )
+
+
+class TestCompactImportHistory(CsvImportTestCase):
+    def test_compact_import_history(self):
+        rows = [self.make_row(1), self.make_row(2)]
+        path = self.write_csv("compact.csv", rows)
+        call_command("import_example_data", path)
+        # Re-importing deletes the first FIA's models, but keeps its audit trail
+        call_command("import_example_data", path, overwrite=True)
+        file_importer = FileImporter.objects.get()
+        superseded, latest = FileImportAttempt.objects.order_by("created_on")
+        self.assertEqual(file_importer.latest_file_import_attempt, latest)
+        superseded_status = superseded.status
+        latest_status = latest.status
+        latest_row_data_ids = set(latest.row_datas.values_list("id", flat=True))
+
+        # A superseded FIA whose imported models still exist can't be compacted
+        __, with_importees = FileImporter.objects.create_with_attempt(
+            path="/foo/bar.csv", importer_name="TestCompactImportHistory"
+        )
+        row_data = RowData.objects.create(
+            file_import_attempt=with_importees, row_num=2, data={"foo": "bar"}
+        )
+        __, structure_import_attempt = ModelImporter.objects.create_with_attempt(
+            model=Structure,
+            row_data=row_data,
+            importee_field_data={},
+            errors={},
+            error_summary={},
+            imported_by="TestCompactImportHistory",
+        )
+        structure = Structure.objects.create(
+            location="foo", model_import_attempt=structure_import_attempt
+        )
+        FileImportAttempt.objects.create(
+            imported_from="/foo/bar.csv", file_importer=with_importees.file_importer
+        )
+
+        output = StringIO()
+        with redirect_stdout(output):
+            call_command(
+                "compact_import_history", "--keep-last", "1", "--archive-rows", "gzip"
+            )
+        self.assertIn(
+            f"Skipped 1 File Import Attempts whose imported models still exist: "
+            f"[{with_importees.id}]",
+            output.getvalue(),
+        )
+
+        # The superseded FIA was archived...
+        archive = FileImportAttemptArchive.objects.get()
+        self.assertEqual(archive.file_import_attempt, superseded)
+        self.assertEqual(archive.num_rows, 2)
+        self.assertEqual(
+            archive.summary,
+            {
+                "row_statuses": {RowData.STATUSES.created_clean.value: 2},
+                "num_model_importers": 6,
+                "num_model_import_attempts": 6,
+            },
+        )
+        self.assertEqual(
+            archive.load_rows(),
+            [{"row_num": 2, "data": rows[0]}, {"row_num": 3, "data": rows[1]}],
+        )
+        # ...and its rows (along with their MIs and MIAs) were removed
+        self.assertFalse(superseded.row_datas.exists())
+        self.assertFalse(
+            ModelImporter.objects.filter(
+                row_data__file_import_attempt=superseded
+            ).exists()
+        )
+        superseded.refresh_from_db()
+        self.assertEqual(superseded.status, superseded_status)
+
+        # The latest FIA is untouched
+        latest.refresh_from_db()
+        self.assertEqual(latest.status, latest_status)
+        self.assertEqual(
+            set(latest.row_datas.values_list("id", flat=True)), latest_row_data_ids
+        )
+        self.assertEqual(Case.objects.count(), 2)
+        # So is the skipped FIA
+        self.assertTrue(with_importees.row_datas.exists())
+        self.assertTrue(Structure.objects.filter(id=structure.id).exists())
+
+        # Re-deriving statuses doesn't reset the archived FIA's
+        FileImportAttempt.objects.all().derive_values(propagate_derived_values=False)
+        superseded.refresh_from_db()
+        self.assertEqual(superseded.status, superseded_status)
+
+
+class TestPurgeImportBatches(CsvImportTestCase):
+    def test_purge_import_batches(self):
+        path_a = self.write_csv("a.csv", [self.make_row(1), self.make_row(2)])
+        path_b = self.write_csv("b.csv", [self.make_row(3)])
+        call_command("import_example_data", path_a)
+        # The second batch supersedes the first batch's attempt at a.csv
+        call_command("import_example_data", path_a, path_b, overwrite=True)
+        purged_batch, kept_batch = FileImporterBatch.objects.order_by("created_on")
+        superseded = FileImportAttempt.objects.get(file_importer_batch=purged_batch)
+        kept_file_import_attempt_ids = set(
+            kept_batch.file_import_attempts.values_list("id", flat=True)
+        )
+        self.assertEqual(len(kept_file_import_attempt_ids), 2)
+        kept_row_data_ids = set(
+            RowData.objects.filter(
+                file_import_attempt__in=kept_file_import_attempt_ids
+            ).values_list("id", flat=True)
+        )
+        self.assertEqual(len(kept_row_data_ids), 3)
+        kept_case_ids = set(Case.objects.values_list("id", flat=True))
+        self.assertEqual(len(kept_case_ids), 3)
+
+        output = StringIO()
+        with redirect_stdout(output):
+            call_command("purge_import_batches", str(purged_batch.id))
+        self.assertIn(
+            "Purging 1 File Import Attempts from 1 File Importer Batches",
+            output.getvalue(),
+        )
+
+        # The purged batch, its attempt and everything beneath it are gone...
+        self.assertFalse(FileImporterBatch.objects.filter(id=purged_batch.id).exists())
+        self.assertFalse(FileImportAttempt.objects.filter(id=superseded.id).exists())
+        self.assertFalse(
+            RowData.objects.filter(file_import_attempt=superseded.id).exists()
+        )
+        self.assertFalse(
+            ModelImportAttempt.objects.filter(
+                model_importer__row_data__file_import_attempt=superseded.id
+            ).exists()
+        )
+        # ...but the other batch is intact
+        self.assertTrue(FileImporterBatch.objects.filter(id=kept_batch.id).exists())
+        self.assertEqual(
+            set(FileImportAttempt.objects.values_list("id", flat=True)),
+            kept_file_import_attempt_ids,
+        )
+        self.assertEqual(
+            set(RowData.objects.values_list("id", flat=True)), kept_row_data_ids
+        )
+        self.assertEqual(set(Case.objects.values_list("id", flat=True)), kept_case_ids)
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(Structure.objects.count(), 3)
+        self.assertEqual(FileImporter.objects.count(), 2)